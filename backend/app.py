@@ -1,17 +1,37 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends, Request
+from fastapi.responses import Response, StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-import os, shutil, logging, sys
+import os, logging, sys
+from uuid import uuid4
 
 # ensure import of your models directory
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'models')))
 
-from backend.models.pdf_converter import pdf_to_markdown, save_markdown_to_file, markdown_to_pdf
-from backend.models.llm import generate_optimized_resume
-from backend.auth import router as auth_router  # Import auth router
+from backend.models.pdf_converter import save_markdown_to_file
+from backend.models.pipeline import extract_markdown_bytes, optimize_markdown, render_pdf
+from backend.models.ingest import read_pdf_upload, UploadRejected
+from backend.models.workers import PoolSaturated, shutdown_pools
+from backend.models.llm import stream_optimized_resume
+from backend.models.llm_gateway import CircuitOpenError
+from backend.models.sse import relay_tokens, SSE_HEADERS
+from backend.auth import router as auth_router, principal_cache  # Import auth router
 from backend.jobsuggest import router as jobsuggest_router #import job suggest fastapi router
 from backend.chatbot import router as chatbot_router # import chatbot fastapi router
+from backend.jobs import router as jobs_router, job_queue # async optimization jobs
+from backend.score import router as score_router # ATS keyword scoring
+from backend.batch import router as batch_router # one resume, many job descriptions
+from backend.images import router as images_router # profile image thumbnails
+from backend.models.http_client import close_client
+from backend.models.db import init_db, dispose_engines
+from backend.models.metrics import MetricsMiddleware, render_metrics, stage_timer, cache_metrics, GaugeCallback
+from backend.models.extraction_cache import extraction_cache
+from backend.models.llm import result_cache
+from backend.models.adzuna import search_cache
+from backend.models.llm_gateway import gateway
+from backend.models.workers import cpu_pool
+from backend.models.blob_store import blob_store
+from backend.models.static_files import PrecompressedStaticFiles
+from starlette.concurrency import run_in_threadpool
 
 app = FastAPI()
 # CORS middleware
@@ -22,6 +42,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# request counts/latency, X-Request-ID, optional TIMING_LOGS lines
+app.add_middleware(MetricsMiddleware)
 
 # 1) Include auth endpoints before other routes
 app.include_router(auth_router)
@@ -31,49 +53,147 @@ app.include_router(jobsuggest_router)
 
 app.include_router(chatbot_router)# chatbot router
 
+app.include_router(jobs_router) # /jobs/ submit, status and download
+
+app.include_router(score_router) # /score keyword matching
+
+app.include_router(batch_router) # /upload/batch
+
+app.include_router(images_router) # /images/{digest}
+
 # 2) Define upload endpoint before mounting static files
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODELS_DIR = os.path.join(BASE_DIR, "backend", "models")
-UPLOAD_DIR = os.path.join(MODELS_DIR, "uploads")
 OUTPUT_DIR = os.path.join(MODELS_DIR, "outputs")
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# results are rendered and returned in memory; set PERSIST_OUTPUTS=true to
+# also keep a copy of each optimized .md/.pdf under OUTPUT_DIR
+PERSIST_OUTPUTS = os.getenv("PERSIST_OUTPUTS", "false").lower() in ("1", "true", "yes")
+
+# STATIC_DIR (default "frontend", relative to the working directory like before)
+frontend = PrecompressedStaticFiles()
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# values read from the live objects on every scrape
+cache_metrics({"extraction": extraction_cache, "llm_result": result_cache, "adzuna": search_cache,
+               "principal": principal_cache})
+GaugeCallback("worker_pool_pending", "Tasks submitted to a worker pool and not finished.", ("pool",),
+              lambda: {("cpu",): cpu_pool.pending})
+GaugeCallback("job_queue_depth", "Jobs waiting for a /jobs/ worker.", (),
+              lambda: {(): job_queue.backlog()})
+GaugeCallback("llm_rate_limit_waiters", "Calls waiting for LLM rate-limit capacity.", (),
+              lambda: {(): gateway.limiter.waiting})
+GaugeCallback("llm_circuit_open", "1 while the LLM circuit breaker rejects calls.", (),
+              lambda: {(): int(gateway.breaker.state == "open")})
+GaugeCallback("blob_store_bytes", "Bytes held in the upload blob store.", (),
+              lambda: {(): blob_store.stats()["total_bytes"]})
+GaugeCallback("blob_store_blobs", "Blobs in the upload blob store.", (),
+              lambda: {(): blob_store.stats()["blobs"]})
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+async def start_resources():
+    # schema is created here, not as a side effect of importing models.db
+    init_db()
+    job_queue.start()
+    blob_store.open()
+    blob_store.start_gc()
+    # compress the frontend once now instead of per request
+    await run_in_threadpool(frontend.preload)
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    # release pooled keep-alive connections and worker pools
+    await job_queue.stop()
+    await blob_store.stop_gc()
+    await close_client()
+    await dispose_engines()
+    shutdown_pools()
+
 @app.post("/upload/")
 async def upload_and_download_resume(
     file: UploadFile = File(...),
     job_description: str = Form(...),
     # if you add authentication, you can depend on a token here
 ):
-    file_location = os.path.join(UPLOAD_DIR, file.filename)
     try:
-        with open(file_location, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        logger.info(f"Uploaded '{file.filename}'")
-        md = pdf_to_markdown(file_location)
-        optimized = generate_optimized_resume(md, job_description)
-        md_file = save_markdown_to_file(optimized, "Optimized_Resume.md")
-        pdf_out = os.path.join(OUTPUT_DIR, "Formatted_Resume.pdf")
-        markdown_to_pdf(md_file, pdf_out)
-
-        return FileResponse(
-            path=pdf_out,
-            filename="Optimized_Resume.pdf",
-            media_type="application/pdf"
+        # one pass over the upload: size/type checks and the content hash, nothing written to disk
+        # (still the "save" stage in pipeline_stage_duration_seconds, so existing dashboards keep working)
+        with stage_timer("save"):
+            pdf = await read_pdf_upload(file)
+
+        logger.info(f"Uploaded '{file.filename}' ({pdf.size} bytes, {pdf.pages} pages)")
+        # extraction/rendering run in the process pool, the LLM call via the gateway
+        md = await extract_markdown_bytes(pdf.data, pdf.digest)
+        optimized = await optimize_markdown(md, job_description)
+        pdf_bytes = await render_pdf(optimized)
+
+        if PERSIST_OUTPUTS:
+            # unique names so concurrent requests never overwrite each other
+            stem = f"Optimized_Resume_{uuid4().hex}"
+            save_markdown_to_file(optimized, f"{stem}.md")
+            with open(os.path.join(OUTPUT_DIR, f"{stem}.pdf"), "wb") as f:
+                f.write(pdf_bytes)
+
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="Optimized_Resume.pdf"'},
         )
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except PoolSaturated as e:
+        logger.warning(f"Rejecting upload: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "5"})
+    except CircuitOpenError as e:
+        logger.warning(f"Rejecting upload: {e}")
+        raise HTTPException(status_code=503, detail="AI service is unavailable, please retry shortly",
+                            headers={"Retry-After": str(int(e.retry_after))})
     except Exception as e:
         logger.error(f"Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/upload/stream")
+async def stream_optimized_preview(
+    request: Request,
+    file: UploadFile = File(...),
+    job_description: str = Form(...),
+):
+    """
+    Stream a preview of the optimized Markdown as Server-Sent Events
+    (`token` events, then `done` or `error`). The finished text is cached,
+    so a following /upload/ with the same resume and job description skips the LLM.
+    """
+    try:
+        pdf = await read_pdf_upload(file)
+        md = await extract_markdown_bytes(pdf.data, pdf.digest)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except PoolSaturated as e:
+        logger.warning(f"Rejecting preview: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "5"})
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        relay_tokens(request, stream_optimized_resume(md, job_description)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
 # 3) Mount frontend folder for static files and SPA fallback last
+# (Brotli/gzip bodies, ETag/304, immutable caching for hashed assets)
 app.mount(
     "/",
-    StaticFiles(directory="frontend", html=True),
+    frontend,
     name="frontend",
 )
 
@@ -1,24 +1,31 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
 from pydantic import BaseModel, EmailStr
-from fastapi.security import OAuth2PasswordRequestForm
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
-import shutil
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
 import os
-from uuid import uuid4
+from starlette.concurrency import run_in_threadpool
 
-from backend.models.db import get_db, User
+from backend.models.db import run_db, User
+from backend.models.passwords import hash_password, verify_password
+from backend.models.workers import PoolSaturated
+from backend.models.tokens import create_access_token, decode_access_token, InvalidToken, ACCESS_TOKEN_TTL
+from backend.models.cache import TTLCache
+from backend.models.blob_store import blob_store
+from backend.models.ingest import UploadRejected, read_upload
+from backend.models.thumbnails import MAX_IMAGE_MB, probe_image, schedule_thumbnails
 
 # create the router with tags for better doc grouping
 router = APIRouter(tags=["auth"])
 
-# password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Authorization: Bearer <token>, as issued by /login
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-# directory for uploaded profile images (absolute path)
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_DIR = os.path.join(BASE_DIR, "uploads", "users")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# user id -> UserProfile, so authenticated requests skip the users table;
+# entries are dropped on profile changes and otherwise expire after the TTL
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_ENTRIES", "10000"))
+principal_cache = TTLCache(max_entries=PRINCIPAL_CACHE_ENTRIES, ttl=PRINCIPAL_CACHE_TTL)
 
 # -------------------------------
 # Response Schemas
@@ -30,6 +37,87 @@ class LoginResponse(BaseModel):
     access_token: str
     token_type: str
     username: str
+    expires_in: int
+
+class UserProfile(BaseModel):
+    id: int
+    username: str
+    name: str
+    email: str
+    profile_image: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+# -------------------------------
+# Current user dependency
+# -------------------------------
+def invalidate_principal(user_id: int):
+    """Call after changing a user's row so the next request reloads it."""
+    principal_cache.pop(user_id)
+
+# -------------------------------
+# Queries (sync SQLAlchemy, run off the event loop via run_db)
+# -------------------------------
+def _user_by_id(db, user_id: int):
+    return db.query(User).filter(User.id == user_id).first()
+
+def _user_by_username(db, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+def _username_or_email_taken(db, username: str, email: str) -> bool:
+    return db.query(User.id).filter((User.username == username) | (User.email == email)).first() is not None
+
+def _add_user(db, **fields):
+    user = User(**fields)
+    db.add(user)
+    db.flush()
+    return user
+
+def _set_password(db, user_id: int, hashed: str):
+    db.query(User).filter(User.id == user_id).update({User.password: hashed})
+
+def _update_profile(db, user_id: int, name: Optional[str], email: Optional[str]):
+    """Returns (user, error message)."""
+    user = _user_by_id(db, user_id)
+    if user is None:
+        return None, "User not found"
+    if email and email != user.email:
+        if db.query(User.id).filter(User.email == email).first():
+            return user, "Email already registered"
+        user.email = email
+    if name:
+        user.name = name
+    return user, None
+
+async def _load_principal(user_id: int):
+    user = await run_db(_user_by_id, user_id)
+    return UserProfile.from_orm(user) if user else None
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserProfile:
+    """
+    Resolve the caller from a bearer token: the signature is checked locally
+    and the user comes from principal_cache, so only a cache miss touches the DB.
+    """
+    unauthorized = HTTPException(
+        status_code=401,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        claims = decode_access_token(token)
+        user_id = int(claims["uid"])
+    except (InvalidToken, KeyError, TypeError, ValueError):
+        raise unauthorized
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = await _load_principal(user_id)
+        if principal is None:
+            # deleted since the token was issued
+            raise unauthorized
+        principal_cache.set(user_id, principal)
+    return principal
 
 # -------------------------------
 # Register Route
@@ -46,46 +134,54 @@ async def register_user(
     email: EmailStr = Form(...),
     password: str = Form(...),
     file: UploadFile = File(None),
-    db: Session = Depends(get_db),
 ):
     """
     Create a new user with optional profile image upload.
     """
     # check for existing user/email
-    existing_user = (
-        db.query(User)
-        .filter((User.username == username) | (User.email == email))
-        .first()
-    )
-    if existing_user:
+    if await run_db(_username_or_email_taken, username, email):
         raise HTTPException(
             status_code=400,
             detail="Username or email already registered",
         )
 
-    # hash the password
-    hashed_password = pwd_context.hash(password)
+    # hash the password (bcrypt runs in the password pool, not on the event loop)
+    try:
+        hashed_password = await hash_password(password)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "2"})
 
-    # handle profile image if provided
-    image_path = None
+    # handle profile image if provided: only the header is checked here, the
+    # thumbnails are rendered in the background; the user row keeps a reference to its blob
+    image_blob = None
     if file:
-        ext = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid4()}{ext}"
-        image_path = os.path.join(UPLOAD_DIR, unique_filename)
-        with open(image_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        try:
+            data, digest = await read_upload(file, int(MAX_IMAGE_MB * 1024 * 1024))
+            await run_in_threadpool(probe_image, data)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        except ValueError as e:
+            raise HTTPException(status_code=415, detail=str(e))
+        image_blob = await run_in_threadpool(blob_store.put_bytes, data, True, digest)
 
     # create and persist user
-    new_user = User(
-        username=username,
-        name=name,
-        email=email,
-        password=hashed_password,
-        profile_image=image_path,
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        await run_db(
+            _add_user,
+            username=username,
+            name=name,
+            email=email,
+            password=hashed_password,
+            profile_image=image_blob,
+        )
+    except IntegrityError:
+        # a concurrent signup took the username/email after our check
+        if image_blob:
+            await run_in_threadpool(blob_store.decref, image_blob)
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+
+    if image_blob:
+        schedule_thumbnails(image_blob)
 
     return {"message": "User registered successfully"}
 
@@ -97,22 +193,62 @@ async def register_user(
     response_model=LoginResponse,
     summary="Authenticate user and return access token",
 )
-def login_user(
+async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
 ):
     """
-    Verify credentials and return a JWT access token (stubbed).
+    Verify credentials and return a signed (HS256) access token.
     """
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not pwd_context.verify(form_data.password, user.password):
+    user = await run_db(_user_by_username, form_data.username)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        valid, new_hash = await verify_password(form_data.password, user.password)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "2"})
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # stored hash predates the current BCRYPT_ROUNDS: replace it while we have the password
+    if new_hash:
+        await run_db(_set_password, user.id, new_hash)
 
-    # TODO: implement real JWT creation
-    token = "fake-jwt-token"
+    token = create_access_token(user.username, claims={"uid": user.id})
 
     return LoginResponse(
         access_token=token,
         token_type="bearer",
         username=user.username,
+        expires_in=ACCESS_TOKEN_TTL,
     )
+
+# -------------------------------
+# Profile Routes
+# -------------------------------
+@router.get(
+    "/me",
+    response_model=UserProfile,
+    summary="Get the current user's profile",
+)
+async def read_profile(current_user: UserProfile = Depends(get_current_user)):
+    return current_user
+
+@router.patch(
+    "/me",
+    response_model=UserProfile,
+    summary="Update the current user's name or email",
+)
+async def update_profile(
+    name: Optional[str] = Form(None),
+    email: Optional[EmailStr] = Form(None),
+    current_user: UserProfile = Depends(get_current_user),
+):
+    try:
+        user, error = await run_db(_update_profile, current_user.id, name, email)
+    except IntegrityError:
+        user, error = None, "Email already registered"
+    if error:
+        raise HTTPException(status_code=404 if user is None else 400, detail=error)
+
+    invalidate_principal(user.id)
+    return UserProfile.from_orm(user)
@@ -0,0 +1,115 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional
+import os
+import io
+import json
+import base64
+import asyncio
+import logging
+import zipfile
+
+from backend.models.pipeline import extract_markdown_bytes, optimize_markdown, render_pdf
+from backend.models.ingest import read_pdf_upload, UploadRejected
+from backend.models.workers import PoolSaturated
+from backend.models.llm_gateway import BATCH
+from backend.score import parse_job_descriptions
+
+router = APIRouter(tags=["batch"])
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+# LLM + render pipelines run at once for a single batch request
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "5"))
+
+
+async def _optimize_one(index: int, md: str, job_description: str, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        try:
+            optimized = await optimize_markdown(md, job_description, priority=BATCH)
+            pdf_bytes = await render_pdf(optimized)
+            return {"index": index, "status": "done", "pdf": pdf_bytes}
+        except Exception as e:
+            logger.error(f"Batch item {index} failed: {e}")
+            return {"index": index, "status": "failed", "error": str(e)}
+
+
+def _zip_results(results: list) -> bytes:
+    buffer = io.BytesIO()
+    manifest = []
+    # PDFs are already compressed, so store them as-is
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zf:
+        for item in sorted(results, key=lambda r: r["index"]):
+            entry = {"index": item["index"], "status": item["status"]}
+            if item["status"] == "done":
+                entry["file"] = f"{item['index'] + 1:02d}_Optimized_Resume.pdf"
+                zf.writestr(entry["file"], item["pdf"])
+            else:
+                entry["error"] = item["error"]
+            manifest.append(entry)
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+    return buffer.getvalue()
+
+
+@router.post("/upload/batch", summary="Optimize one resume for many job descriptions")
+async def optimize_batch(
+    file: UploadFile = File(...),
+    job_description: List[str] = Form([]),
+    job_descriptions: Optional[str] = Form(None),
+    format: str = Query("zip", regex="^(zip|ndjson)$", description="zip archive, or NDJSON lines as items finish"),
+    concurrency: int = Query(BATCH_CONCURRENCY, ge=1, le=BATCH_CONCURRENCY),
+):
+    """
+    Parse the resume once, then optimize and render it for every job
+    description concurrently (at most `concurrency` at a time).
+
+    - `format=zip` returns one archive with NN_Optimized_Resume.pdf per
+      successful item and a manifest.json listing failures.
+    - `format=ndjson` streams one JSON line per item as soon as it finishes:
+      {"index", "status", "pdf_base64" | "error"}.
+    """
+    jds = parse_job_descriptions(job_description, job_descriptions, max_items=BATCH_MAX_ITEMS)
+
+    try:
+        pdf = await read_pdf_upload(file)
+        md = await extract_markdown_bytes(pdf.data, pdf.digest)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except PoolSaturated as e:
+        logger.warning(f"Rejecting batch: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "5"})
+    if not md:
+        raise HTTPException(status_code=422, detail="No text could be extracted from the PDF")
+
+    logger.info(f"Batch of {len(jds)} job descriptions for '{file.filename}'")
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.create_task(_optimize_one(i, md, jd, semaphore)) for i, jd in enumerate(jds)]
+
+    if format == "zip":
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return Response(
+            content=_zip_results(results),
+            media_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="Optimized_Resumes.zip"'},
+        )
+
+    async def stream_results():
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                if "pdf" in item:
+                    item["pdf_base64"] = base64.b64encode(item.pop("pdf")).decode("ascii")
+                yield json.dumps(item) + "\n"
+        finally:
+            # client went away (or we're done): don't keep spending LLM calls
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
@@ -0,0 +1,96 @@
+"""
+Benchmark: what a burst of signups does to the event loop.
+
+Runs --signups concurrent bcrypt hashes two ways, inline on the event loop
+(what register_user used to do) and through the password pool, while a
+probe task measures how late a 10 ms timer fires. That lateness is the
+latency every other route would see on top of its own work. Also prints the
+cost of one hash per bcrypt cost factor, to help pick BCRYPT_ROUNDS.
+
+Run from the repo root:
+    python -m backend.benchmarks.bench_auth --signups 20 --rounds 12
+
+For the same check end to end against a running server:
+    python -m backend.loadtest.loadgen --scenarios register:1,chat:4 --duration 30
+"""
+import os
+import time
+import asyncio
+import argparse
+import statistics
+
+PROBE_INTERVAL = 0.01
+
+
+def cost_table(rounds_list):
+    from passlib.hash import bcrypt
+    print(f"{'rounds':>6}{'ms/hash':>10}")
+    for rounds in rounds_list:
+        handler = bcrypt.using(rounds=rounds)
+        start = time.perf_counter()
+        handler.hash("benchmark-password")
+        print(f"{rounds:>6}{(time.perf_counter() - start) * 1000:>10.1f}")
+
+
+async def probe(stop: asyncio.Event, lags: list):
+    """Record how late each PROBE_INTERVAL sleep wakes up."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def burst(mode: str, signups: int) -> dict:
+    from backend.models.passwords import pwd_context, hash_password
+
+    async def inline_hash(password):
+        return pwd_context.hash(password)
+
+    do_hash = inline_hash if mode == "inline" else hash_password
+    stop, lags = asyncio.Event(), []
+    probe_task = asyncio.create_task(probe(stop, lags))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(do_hash(f"password-{i}") for i in range(signups)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    lags.sort()
+    return {
+        "mode": mode,
+        "signups_per_s": signups / elapsed,
+        "burst_s": elapsed,
+        "lag_p50_ms": statistics.median(lags),
+        "lag_p99_ms": lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+        "lag_max_ms": lags[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signups", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=None, help="BCRYPT_ROUNDS to benchmark (default: the configured one)")
+    parser.add_argument("--cost-table", default="10,11,12,13", help="comma-separated cost factors to time; empty to skip")
+    args = parser.parse_args()
+    if args.rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    if args.cost_table:
+        cost_table([int(r) for r in args.cost_table.split(",")])
+        print()
+
+    from backend.models.passwords import BCRYPT_ROUNDS
+    from backend.models.workers import PASSWORD_WORKERS, shutdown_pools
+    print(f"{args.signups} concurrent signups, bcrypt rounds {BCRYPT_ROUNDS}, {PASSWORD_WORKERS} password workers")
+    print(f"{'mode':<8}{'signups/s':>11}{'burst s':>9}{'loop lag p50 ms':>17}{'p99 ms':>9}{'max ms':>9}")
+    for mode in ("inline", "pool"):
+        r = asyncio.run(burst(mode, args.signups))
+        print(f"{r['mode']:<8}{r['signups_per_s']:>11.1f}{r['burst_s']:>9.2f}"
+              f"{r['lag_p50_ms']:>17.1f}{r['lag_p99_ms']:>9.1f}{r['lag_max_ms']:>9.1f}")
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
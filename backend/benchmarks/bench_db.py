@@ -0,0 +1,107 @@
+"""
+Benchmark: concurrent /register and /login throughput against a scratch
+SQLite database, for each combination of engine (async aiosqlite vs sync
+in the threadpool) and journal mode (WAL vs the old rollback journal).
+
+Each combination runs in its own process, since the engine is configured
+at import time from the environment. bcrypt is set to a low cost by default
+so the numbers reflect the database layer, not hashing.
+
+Run from the repo root:
+    python -m backend.benchmarks.bench_db --users 200 --concurrency 20
+    python -m backend.benchmarks.bench_db --modes async:WAL,sync:DELETE --bcrypt-rounds 12
+"""
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+async def _phase(client, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one(method, url, data):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, data=data)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 300:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(*r) for r in requests))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "req_per_s": len(requests) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": _percentile(latencies, 95),
+        "failures": failures,
+    }
+
+
+def run_mode(mode: str, journal: str, users: int, concurrency: int, bcrypt_rounds: int) -> dict:
+    """Runs in a fresh process: configure the DB layer via env, then drive the auth router in-process."""
+    workdir = tempfile.mkdtemp(prefix="bench_db_")
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        DB_ASYNC="true" if mode == "async" else "false",
+        SQLITE_JOURNAL_MODE=journal,
+        BCRYPT_ROUNDS=str(bcrypt_rounds),
+        JWT_SECRET="bench",
+    )
+    import httpx
+    from fastapi import FastAPI
+    from backend.auth import router
+    from backend.models.db import init_db, dispose_engines
+
+    app = FastAPI()
+    app.include_router(router)
+    init_db()
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            register = [("POST", "/register", {"username": f"user{i}", "name": f"User {i}",
+                                               "email": f"user{i}@example.com", "password": "pw"}) for i in range(users)]
+            login = [("POST", "/login", {"username": f"user{i}", "password": "pw"}) for i in range(users)]
+            results = {"register": await _phase(client, register, concurrency),
+                       "login": await _phase(client, login, concurrency)}
+        await dispose_engines()
+        return results
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--modes", default="async:WAL,sync:WAL,sync:DELETE",
+                        help="comma-separated engine:journal_mode pairs")
+    args = parser.parse_args()
+
+    print(f"{args.users} users, concurrency {args.concurrency}, bcrypt rounds {args.bcrypt_rounds}")
+    print(f"{'engine':<7}{'journal':<9}{'phase':<10}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'failed':>8}")
+    ctx = multiprocessing.get_context("spawn")
+    for spec in args.modes.split(","):
+        mode, _, journal = spec.partition(":")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results = pool.submit(run_mode, mode, journal or "WAL", args.users, args.concurrency, args.bcrypt_rounds).result()
+        for phase, r in results.items():
+            print(f"{mode:<7}{journal:<9}{phase:<10}{r['req_per_s']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['failures']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Micro-benchmarks for the CPU-bound document stages, on generated resumes of
+1, 5, 20 and 100 pages:
+
+    pdf_to_markdown   PyMuPDF text -> page-by-page Markdown (uncached path)
+    extract_text      PyMuPDF plain text, as used by /suggest-jobs/ (uncached path)
+    markdown_to_html  Markdown -> HTML document (PdfRenderer.to_html)
+    write_pdf         WeasyPrint HTML -> PDF bytes with the precompiled stylesheet
+
+Each (stage, size) pair runs in a fresh process so peak RSS is not polluted
+by earlier cases. Wall time is measured over --runs iterations after one
+warm-up; Python allocations come from one extra tracemalloc-instrumented
+run (native allocations by MuPDF/pango only show up in RSS).
+
+Run from the repo root:
+    python -m backend.benchmarks.bench_pipeline --runs 5 --output bench.json
+    python -m backend.benchmarks.bench_pipeline --pages 1,5 --stages write_pdf --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import statistics
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+# pdf_converter imports `llm` as a top-level module, like backend/app.py sets up
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "models")))
+
+STAGES = ("pdf_to_markdown", "extract_text", "markdown_to_html", "write_pdf")
+DEFAULT_PAGES = (1, 5, 20, 100)
+# roughly what fits on one A4 page of the generated PDF
+LINES_PER_PAGE = 45
+
+
+# -------------------------------
+# Fixtures
+# -------------------------------
+def fixture_lines(pages: int) -> list:
+    """Deterministic resume-like text, LINES_PER_PAGE lines per page."""
+    lines = ["JANE DOE", "jane@example.com | +1 555 0100 | linkedin.com/in/janedoe", "",
+             "PROFESSIONAL SUMMARY",
+             "Backend engineer with 6 years of experience building Python services on AWS.", "",
+             "SKILLS", "Python, FastAPI, Django, SQL, PostgreSQL, Redis, Docker, Kubernetes, AWS", "",
+             "EXPERIENCE"]
+    i = 0
+    while len(lines) < pages * LINES_PER_PAGE:
+        if i % 12 == 0:
+            lines += ["", f"Senior Software Engineer, Company {i // 12} (20{10 + i % 10} - 20{11 + i % 10})"]
+        lines.append(f"- Shipped improvement #{i}, cutting p95 latency of service {i % 7} by {i % 40 + 5}%")
+        i += 1
+    return lines[:pages * LINES_PER_PAGE]
+
+
+def fixture_pdf(pages: int) -> bytes:
+    import fitz  # PyMuPDF
+    lines = fixture_lines(pages)
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()  # A4-ish default
+        chunk = lines[p * LINES_PER_PAGE:(p + 1) * LINES_PER_PAGE]
+        page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 40), "\n".join(chunk), fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def fixture_markdown(pages: int) -> str:
+    """The same content as fixture_pdf, written as the optimizer's Markdown output would be."""
+    md = []
+    for line in fixture_lines(pages):
+        if line == "JANE DOE":
+            md.append("# Jane Doe")
+        elif line.isupper():
+            md.append(f"## {line.title()}")
+        elif line.startswith("Senior Software Engineer"):
+            md.append(f"### {line}")
+        else:
+            md.append(line)
+    return "\n".join(md)
+
+
+# -------------------------------
+# Stages (setup -> callable taking the fixture)
+# -------------------------------
+def _stage(name: str, pages: int):
+    """Return (fn, argument) for one stage; imports happen here, inside the worker process."""
+    if name == "pdf_to_markdown":
+        from backend.models.pdf_converter import pdf_bytes_to_markdown
+        return pdf_bytes_to_markdown, fixture_pdf(pages)
+    if name == "extract_text":
+        from backend.models.resume_parser import extract_text_from_bytes
+        return extract_text_from_bytes, fixture_pdf(pages)
+
+    from backend.models.renderer import get_renderer
+    renderer = get_renderer("default")
+    if name == "markdown_to_html":
+        return renderer.to_html, fixture_markdown(pages)
+    if name == "write_pdf":
+        from weasyprint import HTML
+
+        def write_pdf(html):
+            return HTML(string=html).write_pdf(stylesheets=[renderer.stylesheet], font_config=renderer.font_config)
+        return write_pdf, renderer.to_html(fixture_markdown(pages))
+    raise ValueError(f"unknown stage '{name}'")
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(name: str, pages: int, runs: int) -> dict:
+    """Benchmark one stage on one fixture size; meant to run in its own process."""
+    fn, arg = _stage(name, pages)
+    baseline_rss = _max_rss_mb()
+    fn(arg)  # warm-up: lazy imports, font lookup, first-use caches
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    peak_rss = _max_rss_mb()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = fn(arg)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        "stage": name,
+        "pages": pages,
+        "runs": runs,
+        "input_bytes": len(arg),
+        "output_bytes": len(result) if result is not None else 0,
+        "wall_ms": {
+            "min": round(samples[0], 2),
+            "median": round(statistics.median(samples), 2),
+            "mean": round(statistics.mean(samples), 2),
+            "max": round(samples[-1], 2),
+        },
+        "peak_rss_mb": round(peak_rss, 1),
+        "rss_growth_mb": round(peak_rss - baseline_rss, 1),
+        "py_alloc_peak_kb": round((peak - before) / 1024, 1),
+        "py_alloc_retained_kb": round((current - before) / 1024, 1),
+    }
+
+
+def run_isolated(name: str, pages: int, runs: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(measure, name, pages, runs).result()
+
+
+# -------------------------------
+# Reporting
+# -------------------------------
+def metadata() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def print_results(results: list, baseline: dict = None):
+    print(f"{'stage':<18}{'pages':>6}{'median ms':>11}{'min ms':>9}{'peak RSS MB':>13}{'RSS +MB':>9}{'py peak KB':>12}"
+          + ("   vs baseline" if baseline else ""))
+    for r in results:
+        line = (f"{r['stage']:<18}{r['pages']:>6}{r['wall_ms']['median']:>11.2f}{r['wall_ms']['min']:>9.2f}"
+                f"{r['peak_rss_mb']:>13.1f}{r['rss_growth_mb']:>9.1f}{r['py_alloc_peak_kb']:>12.1f}")
+        old = (baseline or {}).get((r["stage"], r["pages"]))
+        if old:
+            change = (r["wall_ms"]["median"] - old["wall_ms"]["median"]) / old["wall_ms"]["median"]
+            line += f"   {change:+.1%}"
+        print(line)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return {(r["stage"], r["pages"]): r for r in json.load(f)["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default=",".join(map(str, DEFAULT_PAGES)), help="comma-separated fixture sizes")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON from an earlier run; prints the median change per case")
+    parser.add_argument("--no-isolate", action="store_true", help="run every case in this process (RSS then accumulates)")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    sizes = [int(p) for p in args.pages.split(",") if p.strip()]
+
+    results = []
+    for name in stages:
+        for pages in sizes:
+            print(f"... {name} x {pages} pages", file=sys.stderr)
+            run = measure if args.no_isolate else run_isolated
+            results.append(run(name, pages, args.runs))
+
+    print_results(results, load_baseline(args.compare) if args.compare else None)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+        print(f"wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark: per-render cost of markdown_to_pdf before and after the
+precompiled PdfRenderer.
+
+Run from the repo root:
+    python -m backend.benchmarks.bench_render --runs 20
+"""
+import argparse
+import statistics
+import time
+
+import markdown
+from weasyprint import HTML
+
+from backend.models.renderer import DEFAULT_CSS, PdfRenderer
+
+SAMPLE_RESUME = """
+# Jane Doe
+jane@example.com | +1 555 0100 | linkedin.com/in/janedoe
+
+## Professional Summary
+Backend engineer with 6 years of experience building Python services on AWS.
+
+## Skills
+- Python, FastAPI, Django, SQL, PostgreSQL, Redis
+- Docker, Kubernetes, Terraform, AWS (ECS, Lambda, RDS)
+
+## Professional Experience
+### Senior Software Engineer, Acme Corp (2021 - Present)
+""" + "\n".join(f"- Shipped improvement #{i}, cutting p95 latency by {i % 40 + 5}%" for i in range(40)) + """
+
+## Education
+B.Tech in Computer Science, Example University, 2018
+"""
+
+
+def legacy_render(md_content):
+    # what markdown_to_pdf did per call before: new converter, CSS re-parsed
+    html = markdown.Markdown(extensions=['extra', 'codehilite', 'toc']).convert(md_content)
+    doc = f"<!DOCTYPE html><html><head><meta charset='UTF-8'><style>{DEFAULT_CSS}</style></head><body>{html}</body></html>"
+    return HTML(string=doc).write_pdf()
+
+
+def time_runs(fn, runs):
+    fn(SAMPLE_RESUME)  # warm-up (imports, first font lookup)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(SAMPLE_RESUME)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    renderer = PdfRenderer(DEFAULT_CSS)
+    results = {
+        "legacy": time_runs(legacy_render, args.runs),
+        "renderer": time_runs(renderer.render, args.runs),
+    }
+
+    for name, samples in results.items():
+        print(f"{name:>9}: mean {statistics.mean(samples):7.1f} ms  median {statistics.median(samples):7.1f} ms  min {min(samples):7.1f} ms")
+    saving = statistics.mean(results["legacy"]) - statistics.mean(results["renderer"])
+    print(f"   saving: {saving:.1f} ms per render ({saving / statistics.mean(results['legacy']):.0%})")
+
+
+if __name__ == "__main__":
+    main()
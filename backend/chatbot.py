@@ -1,9 +1,13 @@
 import os
-import requests
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from pathlib import Path
+from backend.models.http_client import UpstreamError
+from backend.models.llm_gateway import gateway, CircuitOpenError, INTERACTIVE
+from backend.models.sse import relay_tokens, SSE_HEADERS
 
 # --- BEN'S UNIVERSAL PATH FIX ---
 # This looks for the .env file exactly where it lives (inside the backend folder)
@@ -17,15 +21,16 @@ load_dotenv(dotenv_path=env_path)
 
 router = APIRouter(tags=["chatbot"])
 
+# what a typical reply costs against the gateway's tokens/min budget
+CHAT_OUTPUT_TOKENS = int(os.getenv("CHAT_OUTPUT_TOKENS", "400"))
+
 class ChatRequest(BaseModel):
     message: str
 
 class ChatResponse(BaseModel):
     reply: str
 
-@router.post("/chat/", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    # 1. Verify API Key exists
+def _get_api_key():
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         print(f"DEBUG ERROR: API Key not found at {env_path}")
@@ -33,49 +38,55 @@ async def chat(request: ChatRequest):
             status_code=500, 
             detail="GROQ_API_KEY is missing. Please check your backend/.env file."
         )
+    return api_key
 
-    # 2. Craft the prompt
+def _build_messages(message: str):
     prompt = f"""
 You are an expert career advisor chatbot.  
-User: "{request.message}"
+User: "{message}"
 Provide clear, actionable career guidance in your reply.
 """
+    return [{"role": "user", "content": prompt}]
+
+@router.post("/chat/", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    # 1. Verify API Key exists
+    _get_api_key()
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-    
-    payload = {
-        "model": "llama-3.3-70b-versatile", # Updated model name
-        "messages": [{"role": "user", "content": prompt}],
-    }
+    # 2. Craft the prompt
+    messages = _build_messages(request.message)
 
     try:
-        # 3. Call Groq API
-        resp = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30,
-        )
-        
-        # 4. Handle API Response safely
-        res_data = resp.json()
+        # 3. Call Groq through the gateway (rate limited, retried; chat goes first)
+        content = await gateway.chat(messages, priority=INTERACTIVE, timeout=30, expected_output_tokens=CHAT_OUTPUT_TOKENS)
+        return ChatResponse(reply=content)
 
-        if resp.status_code != 200:
-            print(f"GROQ API ERROR: {res_data}")
-            raise HTTPException(status_code=resp.status_code, detail="AI service error")
-
-        # 5. Check if 'choices' exists before accessing (Prevents KeyError)
-        if "choices" in res_data and len(res_data["choices"]) > 0:
-            content = res_data["choices"][0]["message"]["content"].strip()
-            return ChatResponse(reply=content)
-        else:
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail="AI service is unavailable, please retry shortly",
+                            headers={"Retry-After": str(int(e.retry_after))})
+    except UpstreamError as e:
+        # 4. Non-200 from Groq after retries (or a reply without choices)
+        print(f"GROQ API ERROR: {e}")
+        if e.status_code == 200:
             raise HTTPException(status_code=500, detail="Malformed response from AI service")
-
-    except requests.exceptions.Timeout:
+        raise HTTPException(status_code=e.status_code, detail="AI service error")
+    except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="AI service request timed out")
     except Exception as e:
         print(f"INTERNAL ERROR: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Same as /chat/ but relays the reply as Server-Sent Events:
+    `token` events with {"token": "..."} as they arrive, then `done` or `error`.
+    """
+    _get_api_key()
+    tokens = gateway.stream(_build_messages(request.message), priority=INTERACTIVE, timeout=30,
+                            expected_output_tokens=CHAT_OUTPUT_TOKENS)
+    return StreamingResponse(
+        relay_tokens(http_request, tokens),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+import logging
+
+from backend.models.blob_store import blob_store, DIGEST_RE
+from backend.models.db import run_db, User
+from backend.models.http_cache import IMMUTABLE, http_date, not_modified
+from backend.models.thumbnails import THUMBNAIL_SIZES, stored_thumbnails, wait_for_thumbnails
+from backend.models.workers import PoolSaturated
+
+router = APIRouter(tags=["images"])
+logger = logging.getLogger(__name__)
+
+
+def _is_profile_image(db, digest: str) -> bool:
+    return db.query(User.id).filter(User.profile_image == digest).first() is not None
+
+
+def _pick_size(requested: int) -> int:
+    """Smallest stored size that covers the request, else the largest one."""
+    return next((size for size in THUMBNAIL_SIZES if size >= requested), THUMBNAIL_SIZES[-1])
+
+
+@router.get("/images/{digest}", summary="Serve a profile image thumbnail")
+async def get_image(
+    digest: str,
+    request: Request,
+    size: int = Query(128, ge=1, description="Edge length in px; rounded up to a stored size"),
+    format: Optional[str] = Query(None, regex="^(webp|jpeg)$", description="Default: WebP if the client accepts it"),
+):
+    """
+    Square thumbnails of a user's `profile_image`, never the original upload.
+    The URL names fixed content, so responses are cacheable for a year and
+    revalidate to 304 via ETag / Last-Modified.
+    """
+    if not DIGEST_RE.match(digest):
+        raise HTTPException(status_code=404, detail="Image not found")
+    negotiated = format is None
+    if negotiated:
+        format = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+
+    try:
+        variants = await stored_thumbnails(digest)
+        # thumbnails only ever exist for profile images, so the ownership check
+        # is only needed before generating them
+        if not variants and await run_db(_is_profile_image, digest):
+            variants = await wait_for_thumbnails(digest)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "2"})
+    except (ValueError, FileNotFoundError) as e:
+        logger.warning(f"No thumbnails for image {digest[:12]}: {e}")
+        variants = {}
+
+    variant = variants.get((_pick_size(size), format))
+    if variant is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    headers = {
+        "ETag": f'"{variant.blob}"',
+        "Last-Modified": http_date(variant.last_modified),
+        "Cache-Control": IMMUTABLE,
+    }
+    if negotiated:
+        headers["Vary"] = "Accept"
+    if not_modified(request.headers, headers["ETag"], variant.last_modified):
+        return Response(status_code=304, headers=headers)
+    content = await run_in_threadpool(blob_store.read, variant.blob)
+    return Response(content=content, media_type=variant.media_type, headers=headers)
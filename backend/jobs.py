@@ -0,0 +1,118 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import Response
+import logging
+from starlette.concurrency import run_in_threadpool
+
+from backend.models.job_queue import (
+    Job, JobQueue, QueueFull, DONE, FAILED, EXTRACTING, OPTIMIZING, RENDERING,
+)
+from backend.models.pipeline import extract_markdown_bytes, optimize_markdown, render_pdf
+from backend.models.llm_gateway import BATCH
+from backend.models.blob_store import blob_store
+from backend.models.ingest import read_pdf_upload, UploadRejected
+from backend.models.workers import PoolSaturated
+
+router = APIRouter(tags=["jobs"])
+logger = logging.getLogger(__name__)
+
+
+async def run_optimization(job: Job) -> str:
+    """Extract -> optimize -> render for one job, returning the blob digest of the PDF."""
+    job.stage = EXTRACTING
+    data = await run_in_threadpool(blob_store.read, job.params["blob"])
+    md = await extract_markdown_bytes(data, job.params["blob"])
+
+    job.stage = OPTIMIZING
+    # nobody is waiting on the response: yield LLM capacity to interactive callers
+    optimized = await optimize_markdown(md, job.params["job_description"], priority=BATCH)
+
+    job.stage = RENDERING
+    pdf_bytes = await render_pdf(optimized)
+    # the result waits for its download in the blob store, not in memory on the Job
+    return await run_in_threadpool(blob_store.put_bytes, pdf_bytes)
+
+
+async def release_input(job: Job):
+    # the job's references keep its input and result PDFs out of the blob GC until it expires
+    await run_in_threadpool(blob_store.decref, job.params["blob"])
+    if job.result is not None:
+        await run_in_threadpool(blob_store.decref, job.result)
+
+
+# a full CPU pool only delays an accepted job, it never fails it
+job_queue = JobQueue(run_optimization, on_expire=release_input, retry_on=(PoolSaturated,))
+
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+def _reject(e: QueueFull):
+    logger.warning(f"Rejecting job: {e}")
+    raise HTTPException(
+        status_code=503,
+        detail="Too many jobs queued, please retry later",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def _status(job: Job) -> dict:
+    status = job.to_dict()
+    status["queue_position"] = job_queue.queue_position(job)
+    status["status_url"] = f"/jobs/{job.id}"
+    status["download_url"] = f"/jobs/{job.id}/download" if job.stage == DONE else None
+    return status
+
+
+@router.post("/jobs/", status_code=202, summary="Queue a resume optimization job")
+async def submit_job(
+    file: UploadFile = File(...),
+    job_description: str = Form(...),
+):
+    """
+    Accept a resume and job description and return a job id immediately.
+    Poll GET /jobs/{job_id} for progress, then fetch /jobs/{job_id}/download.
+    """
+    # reject before touching the disk when we already know there's no room
+    if job_queue.full():
+        _reject(QueueFull(job_queue.retry_after()))
+
+    try:
+        pdf = await read_pdf_upload(file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    # the job outlives this request, so its input goes to the blob store (hash already known)
+    blob = await run_in_threadpool(blob_store.put_bytes, pdf.data, True, pdf.digest)
+    job = Job(job_description=job_description, filename=file.filename, blob=blob)
+
+    try:
+        job_queue.submit(job)
+    except QueueFull as e:
+        await release_input(job)
+        _reject(e)
+
+    logger.info(f"Queued job {job.id} for '{file.filename}'")
+    return _status(job)
+
+
+@router.get("/jobs/{job_id}", summary="Get the current stage of a job")
+async def get_job(job_id: str):
+    return _status(_get_job_or_404(job_id))
+
+
+@router.get("/jobs/{job_id}/download", summary="Download the optimized resume PDF")
+async def download_job(job_id: str):
+    job = _get_job_or_404(job_id)
+    if job.stage == FAILED:
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    if job.stage != DONE:
+        raise HTTPException(status_code=409, detail=f"Job is not finished (stage: {job.stage})")
+    content = await run_in_threadpool(blob_store.read, job.result)
+    return Response(
+        content=content,
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'attachment; filename="Optimized_Resume.pdf"'},
+    )
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 from fastapi.responses import JSONResponse
-import os
-import shutil
-import requests
 import logging
 from dotenv import load_dotenv
 from pathlib import Path
-from backend.models.resume_parser import extract_text_from_pdf
-from backend.models.groq_llm import get_job_search_query
+from backend.models.resume_parser import aextract_text_from_data
+from backend.models.groq_llm import get_job_search_query, get_job_search_queries
+from backend.models.http_client import UpstreamError
+from backend.models.adzuna import search_jobs, search_many, COUNTRY_RE
+from backend.models.ranking import rank_jobs
+from backend.models.ingest import read_pdf_upload, UploadRejected
+from backend.models.workers import PoolSaturated
 
 # --- BEN'S UNIVERSAL PATH FIX ---
 # This checks the current folder AND the parent folder for the .env
@@ -21,71 +23,65 @@ for loc in env_locations:
 # --------------------------------
 
 router = APIRouter()
-UPLOAD_FOLDER = os.path.join("backend", "models", "uploads")
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+# caps for wide mode, so one request can't fan out into hundreds of Adzuna calls
+MAX_QUERIES = 5
+MAX_PAGES = 5
+MAX_COUNTRIES = 5
 
 @router.post("/suggest-jobs/")
-async def suggest_jobs(file: UploadFile = File(...)):
+async def suggest_jobs(
+    file: UploadFile = File(...),
+    wide: bool = Query(False, description="Fan out over several queries, pages and countries"),
+    queries: int = Query(3, ge=1, le=MAX_QUERIES, description="Alternative queries to generate (wide mode)"),
+    pages: int = Query(1, ge=1, le=MAX_PAGES, description="Result pages per query (wide mode)"),
+    countries: str = Query("in", description="Comma-separated Adzuna country codes; only the first is searched unless wide"),
+    rank: bool = Query(True, description="Sort jobs by local BM25 relevance to the full resume"),
+):
+    country_codes = [c.strip().lower() for c in countries.split(",") if c.strip()][:MAX_COUNTRIES] or ["in"]
+    invalid = [c for c in country_codes if not COUNTRY_RE.match(c)]
+    if invalid:
+        return JSONResponse(content={"error": f"Invalid country code(s): {', '.join(invalid)}"}, status_code=422)
+
     try:
-        # 1. Save and Parse Resume
-        file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        
-        resume_text = extract_text_from_pdf(file_path)
+        # 1. Read (in memory, size/type checked) and Parse Resume
+        try:
+            pdf = await read_pdf_upload(file)
+            # PyMuPDF parsing runs in the process pool, never on the event loop
+            resume_text = await aextract_text_from_data(pdf.data, pdf.digest)
+        except UploadRejected as e:
+            return JSONResponse(content={"error": e.detail}, status_code=e.status_code)
+        except PoolSaturated as e:
+            logging.warning(f"Rejecting job suggestion: {e}")
+            return JSONResponse(content={"error": "Server is busy, please retry shortly"}, status_code=503,
+                                headers={"Retry-After": "5"})
+
+        if wide:
+            # 2. Several alternative queries, all (query, country, page) searches run concurrently
+            search_queries = await get_job_search_queries(resume_text, count=queries)
+            try:
+                formatted_jobs = await search_many(search_queries, countries=country_codes, pages=pages, results_per_page=10)
+            except UpstreamError as e:
+                return JSONResponse(content={"error": f"Adzuna rejection: {e.detail}"}, status_code=500)
+            if rank:
+                formatted_jobs = rank_jobs(resume_text, formatted_jobs)
+            return JSONResponse(content={"jobs": formatted_jobs, "queries": search_queries}, status_code=200)
 
         # 2. Get the "Search Term" from AI
-        raw_query = get_job_search_query(resume_text)
+        raw_query = await get_job_search_query(resume_text)
         # Ensure it's a clean, single-line string
         search_query = str(raw_query).strip().replace("\n", " ")
 
-        # 3. Call Adzuna API
-        app_id = os.getenv("ADZUNA_APP_ID")
-        app_key = os.getenv("ADZUNA_APP_KEY")
-
-        # Log check to your terminal (to see if keys are actually loading)
-        if not app_id or not app_key:
-            logging.error(f"Environment Error: ADZUNA_APP_ID: {app_id}, ADZUNA_APP_KEY: {app_key}")
-            raise ValueError("ADZUNA credentials missing in .env. Ensure they are in backend/.env")
-
-        country = "in" # Change to 'us' or 'gb' as needed
-        url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/1"
-        
-        # We explicitly cast everything to str and remove any potential hidden characters
-        params = {
-            "app_id": str(app_id).strip(),
-            "app_key": str(app_key).strip(),
-            "results_per_page": 10,
-            "what": str(search_query),
-            "content-type": "application/json"
-        }
-
-        # 4. Execute Request
-        response = requests.get(url, params=params, timeout=15)
-        
-        if response.status_code != 200:
+        # 3. Search Adzuna (cached per normalized query; identical lookups share one call)
+        try:
+            formatted_jobs = await search_jobs(search_query, country=country_codes[0], results_per_page=10)
+        except UpstreamError as e:
             # This will show the exact reason Adzuna is rejecting you
-            error_detail = response.text
-            logging.error(f"Adzuna API Error ({response.status_code}): {error_detail}")
-            return JSONResponse(content={"error": f"Adzuna rejection: {error_detail}"}, status_code=500)
+            return JSONResponse(content={"error": f"Adzuna rejection: {e.detail}"}, status_code=500)
 
-        data = response.json()
-        raw_jobs = data.get("results", [])
-        
-        # 5. Clean the data for the Frontend
-        formatted_jobs = []
-        for job in raw_jobs:
-            # Adzuna uses nested dictionaries for company and location
-            company_info = job.get("company", {})
-            location_info = job.get("location", {})
-            
-            formatted_jobs.append({
-                "title": job.get("title", "Job Opportunity").replace("<strong>", "").replace("</strong>", ""),
-                "company": company_info.get("display_name", "Company Confidential"),
-                "location": location_info.get("display_name", "Remote/Not Specified"),
-                "link": job.get("redirect_url"),
-                "description": job.get("description", "No description provided.").replace("<strong>", "").replace("</strong>", "")
-            })
+        # 4. Re-order by relevance to the whole resume, not just the 3-5 word query
+        if rank:
+            formatted_jobs = rank_jobs(resume_text, formatted_jobs)
 
         return JSONResponse(content={"jobs": formatted_jobs}, status_code=200)
 
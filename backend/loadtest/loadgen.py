@@ -0,0 +1,243 @@
+"""
+Closed-loop load generator for the API: `--concurrency` virtual users each
+send requests back to back, picking an endpoint by weight, until
+`--duration` seconds or `--requests` total requests have elapsed.
+Reports throughput and p50/p95/p99 latency per endpoint.
+
+Every upload/suggest request carries a unique resume and job description,
+so the extraction and LLM result caches miss and the full pipeline is
+measured; pass --repeat-payload to send identical payloads (cache-hit path).
+
+Start backend.loadtest.mock_upstreams and the app pointed at it (see that
+module), then from the repo root:
+    python -m backend.loadtest.loadgen --concurrency 20 --duration 30
+    python -m backend.loadtest.loadgen --scenarios chat:5,upload:1 --requests 500 --json results.json
+"""
+import io
+import sys
+import math
+import json
+import time
+import random
+import asyncio
+import argparse
+from uuid import uuid4
+from collections import defaultdict
+
+import fitz  # PyMuPDF
+import httpx
+
+SCENARIOS = ("upload", "suggest", "chat", "register")
+
+JOB_DESCRIPTION = (
+    "We are seeking a Python Developer with expertise in FastAPI or Django, "
+    "PostgreSQL and AWS. Experience with Docker and CI/CD pipelines is a plus."
+)
+
+CHAT_MESSAGES = [
+    "How do I tailor my resume for a backend role?",
+    "What skills should a data engineer highlight?",
+    "How long should my professional summary be?",
+]
+
+
+def sample_resume_pdf(pages: int = 1) -> bytes:
+    """A small text PDF so no fixture file is needed."""
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        lines = ["Jane Doe", "jane@example.com | +1 555 0100", "", "SKILLS",
+                 "Python, FastAPI, SQL, PostgreSQL, Docker, AWS", "", "EXPERIENCE"]
+        lines += [f"- Built service {n}.{i} handling {i * 100} requests/s" for i in range(20)]
+        page.insert_text((50, 60), "\n".join(lines), fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class Payloads:
+    """
+    Resume and job description for each request. Unique by default: a
+    request id is stamped onto page 1 of the PDF and appended to the job
+    description, so content-hash caches can't serve it.
+    """
+
+    def __init__(self, resume: bytes, repeat: bool = False):
+        self.base_resume = resume
+        self.repeat = repeat
+
+    def next(self):
+        if self.repeat:
+            return self.base_resume, JOB_DESCRIPTION
+        request_id = uuid4().hex
+        doc = fitz.open(stream=self.base_resume, filetype="pdf")
+        doc[0].insert_text((50, 30), f"Ref {request_id}", fontsize=8)
+        resume = doc.tobytes()
+        doc.close()
+        return resume, f"{JOB_DESCRIPTION} Requisition {request_id}."
+
+
+# -------------------------------
+# One request per scenario
+# -------------------------------
+async def do_upload(client, payload):
+    resume, job_description = payload
+    files = {"file": ("resume.pdf", io.BytesIO(resume), "application/pdf")}
+    return await client.post("/upload/", files=files, data={"job_description": job_description})
+
+
+async def do_suggest(client, payload):
+    resume, _ = payload
+    files = {"file": ("resume.pdf", io.BytesIO(resume), "application/pdf")}
+    return await client.post("/suggest-jobs/", files=files)
+
+
+async def do_chat(client, payload):
+    return await client.post("/chat/", json={"message": random.choice(CHAT_MESSAGES)})
+
+
+async def do_register(client, payload):
+    name = f"load_{uuid4().hex[:12]}"
+    return await client.post("/register", data={
+        "username": name, "name": "Load Test", "email": f"{name}@example.com", "password": "load-test-password",
+    })
+
+
+ACTIONS = {"upload": do_upload, "suggest": do_suggest, "chat": do_chat, "register": do_register}
+# scenarios whose request body is a resume / job description
+PAYLOAD_SCENARIOS = {"upload", "suggest"}
+
+
+# -------------------------------
+# Driver
+# -------------------------------
+def parse_scenarios(spec: str) -> dict:
+    """'chat:5,upload:1' -> {'chat': 5.0, 'upload': 1.0}; a bare name has weight 1."""
+    weights = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition(":")
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario '{name}', expected one of {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def run_load(base_url, weights, concurrency, duration=None, total=None, timeout=120.0, resume=None,
+                   repeat_payload=False):
+    """Return (samples, elapsed_s); samples are (scenario, status, latency_s), status 0 for transport errors."""
+    payloads = Payloads(resume or sample_resume_pdf(), repeat=repeat_payload)
+    names, cum = list(weights), list(weights.values())
+    samples = []
+    issued = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def user(client):
+        nonlocal issued
+        while True:
+            if deadline and time.perf_counter() >= deadline:
+                return
+            if total is not None:
+                if issued >= total:
+                    return
+                issued += 1
+            scenario = random.choices(names, weights=cum)[0]
+            # built before the clock starts: not part of the measured latency
+            payload = payloads.next() if scenario in PAYLOAD_SCENARIOS else None
+            start = time.perf_counter()
+            try:
+                response = await ACTIONS[scenario](client, payload)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples.append((scenario, status, time.perf_counter() - start))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(user(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples, elapsed) -> dict:
+    groups = defaultdict(list)
+    for scenario, status, latency in samples:
+        groups[scenario].append((status, latency))
+        groups["all"].append((status, latency))
+
+    report = {"elapsed_s": round(elapsed, 2), "endpoints": {}}
+    for scenario, rows in groups.items():
+        latencies = sorted(l * 1000 for _, l in rows)
+        statuses = defaultdict(int)
+        for status, _ in rows:
+            statuses[str(status)] += 1
+        errors = sum(n for s, n in statuses.items() if not s.startswith("2"))
+        report["endpoints"][scenario] = {
+            "requests": len(rows),
+            "errors": errors,
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+            "statuses": dict(statuses),
+        }
+    return report
+
+
+def print_report(report):
+    print(f"\n{'endpoint':<10}{'reqs':>7}{'errs':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}  statuses")
+    endpoints = report["endpoints"]
+    for name in sorted(endpoints, key=lambda n: (n == "all", n)):
+        e = endpoints[name]
+        print(f"{name:<10}{e['requests']:>7}{e['errors']:>7}{e['throughput_rps']:>9.2f}"
+              f"{e['p50_ms']:>10.1f}{e['p95_ms']:>10.1f}{e['p99_ms']:>10.1f}{e['max_ms']:>10.1f}  {e['statuses']}")
+    print(f"\nwall time {report['elapsed_s']}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default="upload,suggest,chat,register",
+                        help="comma-separated names with optional weights, e.g. chat:5,upload:1")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run (default 30 unless --requests)")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--resume", help="PDF to upload instead of the generated sample")
+    parser.add_argument("--repeat-payload", action="store_true",
+                        help="send the same resume and job description every time (measures cache hits)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    duration = args.duration if args.duration or args.requests else 30.0
+    resume = None
+    if args.resume:
+        with open(args.resume, "rb") as f:
+            resume = f.read()
+
+    weights = parse_scenarios(args.scenarios)
+    print(f"{args.concurrency} users against {args.base_url}: {weights}", file=sys.stderr)
+    samples, elapsed = asyncio.run(run_load(
+        args.base_url, weights, args.concurrency, duration=duration, total=args.requests,
+        timeout=args.timeout, resume=resume, repeat_payload=args.repeat_payload,
+    ))
+    report = summarize(samples, elapsed)
+    report["config"] = {"concurrency": args.concurrency, "scenarios": weights,
+                        "duration": duration, "requests": args.requests, "repeat_payload": args.repeat_payload}
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
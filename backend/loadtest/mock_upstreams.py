@@ -0,0 +1,177 @@
+"""
+Local stand-ins for the paid upstream APIs, for load tests.
+
+- POST /openai/v1/chat/completions  Groq/OpenAI-compatible, with "stream": true support
+- GET  /v1/api/jobs/{country}/search/{page}  Adzuna job search
+
+Start it, then point the app at it:
+    python -m backend.loadtest.mock_upstreams --port 9100 --latency-ms 1500 --rate-429 0.05
+
+    GROQ_API_KEY=mock ADZUNA_APP_ID=mock ADZUNA_APP_KEY=mock \
+    GROQ_API_URL=http://127.0.0.1:9100/openai/v1/chat/completions \
+    ADZUNA_API_URL=http://127.0.0.1:9100/v1/api/jobs \
+    uvicorn backend.app:app --port 8000
+
+Every setting can also be given as a MOCK_* environment variable.
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# -------------------------------
+# Settings (override via env or CLI)
+# -------------------------------
+SETTINGS = {
+    # time to a full (non-streamed) completion, and to the first streamed token
+    "latency_ms": float(os.getenv("MOCK_LLM_LATENCY_MS", "800")),
+    # +/- uniform jitter added to every latency
+    "jitter_ms": float(os.getenv("MOCK_JITTER_MS", "200")),
+    # gap between streamed chunks
+    "chunk_ms": float(os.getenv("MOCK_STREAM_CHUNK_MS", "20")),
+    # share of LLM calls answered with 429 + Retry-After
+    "rate_429": float(os.getenv("MOCK_RATE_429", "0")),
+    "retry_after": float(os.getenv("MOCK_RETRY_AFTER", "1")),
+    "adzuna_latency_ms": float(os.getenv("MOCK_ADZUNA_LATENCY_MS", "300")),
+}
+
+MOCK_RESUME = """# Jane Doe
+jane@example.com | +1 555 0100 | linkedin.com/in/janedoe
+
+## Professional Summary
+Backend engineer with 6 years of experience building Python services on AWS.
+
+## Skills
+- Python, FastAPI, Django, SQL, PostgreSQL, Redis
+- Docker, Kubernetes, Terraform, AWS (ECS, Lambda, RDS)
+
+## Professional Experience
+### Senior Software Engineer, Acme Corp (2021 - Present)
+""" + "\n".join(f"- Shipped improvement #{i}, cutting p95 latency by {i % 40 + 5}%" for i in range(12)) + """
+
+## Education
+B.Tech in Computer Science, Example University, 2018
+"""
+
+TITLES = ["Python Developer", "Backend Engineer", "Data Engineer", "DevOps Engineer", "Full Stack Developer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli"]
+
+app = FastAPI(title="Mock upstreams")
+stats = {"llm_calls": 0, "llm_429": 0, "adzuna_calls": 0}
+
+
+async def _sleep(ms: float):
+    jitter = SETTINGS["jitter_ms"]
+    await asyncio.sleep(max(0.0, ms + random.uniform(-jitter, jitter)) / 1000)
+
+
+def _reply_for(messages: list) -> str:
+    prompt = " ".join(str(m.get("content", "")) for m in messages).lower()
+    # job-query prompts ask for a few keywords, optimization prompts for a resume
+    if "search queries" in prompt:
+        return "\n".join(random.sample(TITLES, 3))
+    if "search query" in prompt:
+        return random.choice(TITLES)
+    if "resume optimizer" in prompt:
+        return MOCK_RESUME
+    return "Focus on measurable impact and tailor your skills section to each role."
+
+
+def _usage(messages: list, reply: str) -> dict:
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    completion_tokens = len(reply) // 4
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["llm_calls"] += 1
+    if random.random() < SETTINGS["rate_429"]:
+        stats["llm_429"] += 1
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached (mock)", "type": "tokens"}},
+            status_code=429,
+            headers={"retry-after": str(SETTINGS["retry_after"])},
+        )
+
+    messages = body.get("messages") or []
+    model = body.get("model", "mock")
+    reply = _reply_for(messages)
+    completion_id = f"chatcmpl-{uuid4().hex}"
+
+    if not body.get("stream"):
+        await _sleep(SETTINGS["latency_ms"])
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": _usage(messages, reply),
+        }
+
+    async def events():
+        await _sleep(SETTINGS["latency_ms"])
+        words = reply.split(" ")
+        for i in range(0, len(words), 4):
+            chunk = " ".join(words[i:i + 4]) + (" " if i + 4 < len(words) else "")
+            data = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                    "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]}
+            yield f"data: {json.dumps(data)}\n\n"
+            await asyncio.sleep(SETTINGS["chunk_ms"] / 1000)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/v1/api/jobs/{country}/search/{page}")
+async def adzuna_search(country: str, page: int, what: str = "", results_per_page: int = 10):
+    stats["adzuna_calls"] += 1
+    await _sleep(SETTINGS["adzuna_latency_ms"])
+    results = []
+    for i in range(results_per_page):
+        title = random.choice(TITLES)
+        results.append({
+            "id": f"{country}-{page}-{i}-{random.randint(0, 10 ** 6)}",
+            "title": f"<strong>{title}</strong>",
+            "company": {"display_name": random.choice(COMPANIES)},
+            "location": {"display_name": f"City {i}, {country.upper()}"},
+            "redirect_url": f"https://example.com/jobs/{uuid4().hex}",
+            "description": f"{title} role: {what or 'software'} with Python, SQL and cloud experience.",
+        })
+    return {"count": 1000, "results": results}
+
+
+@app.get("/stats")
+async def get_stats():
+    return {**stats, "settings": SETTINGS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=SETTINGS["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=SETTINGS["jitter_ms"])
+    parser.add_argument("--chunk-ms", type=float, default=SETTINGS["chunk_ms"])
+    parser.add_argument("--rate-429", type=float, default=SETTINGS["rate_429"], help="0..1 share of LLM calls rejected")
+    parser.add_argument("--retry-after", type=float, default=SETTINGS["retry_after"])
+    parser.add_argument("--adzuna-latency-ms", type=float, default=SETTINGS["adzuna_latency_ms"])
+    args = parser.parse_args()
+    for key in SETTINGS:
+        SETTINGS[key] = getattr(args, key)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import os
+import re
+import time
+import asyncio
+import logging
+from dotenv import load_dotenv
+from pathlib import Path
+
+from backend.models.cache import TTLCache, AsyncSingleFlight
+from backend.models.http_client import get_json, UpstreamError
+from backend.models.metrics import upstream_timer, count_error
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+ADZUNA_API_URL = os.getenv("ADZUNA_API_URL", "https://api.adzuna.com/v1/api/jobs")
+ADZUNA_TIMEOUT = float(os.getenv("ADZUNA_TIMEOUT", "15"))
+# results younger than this are served as-is
+ADZUNA_CACHE_TTL = float(os.getenv("ADZUNA_CACHE_TTL", "900"))
+# after that, they're still served for this long while a refresh runs in the background
+ADZUNA_STALE_TTL = float(os.getenv("ADZUNA_STALE_TTL", "3600"))
+ADZUNA_CACHE_ENTRIES = int(os.getenv("ADZUNA_CACHE_ENTRIES", "1024"))
+
+DEFAULT_COUNTRY = "in"  # Change to 'us' or 'gb' as needed
+# Adzuna country codes are two lowercase letters; anything else must not reach the URL path
+COUNTRY_RE = re.compile(r"^[a-z]{2}$")
+
+# key -> (fetched_at, jobs)
+search_cache = TTLCache(max_entries=ADZUNA_CACHE_ENTRIES, ttl=ADZUNA_CACHE_TTL + ADZUNA_STALE_TTL)
+_in_flight = AsyncSingleFlight()
+
+
+def _credentials():
+    app_id = os.getenv("ADZUNA_APP_ID")
+    app_key = os.getenv("ADZUNA_APP_KEY")
+    if not app_id or not app_key:
+        logger.error(f"Environment Error: ADZUNA_APP_ID: {app_id}, ADZUNA_APP_KEY: {app_key}")
+        raise ValueError("ADZUNA credentials missing in .env. Ensure they are in backend/.env")
+    # We explicitly cast everything to str and remove any potential hidden characters
+    return str(app_id).strip(), str(app_key).strip()
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", str(query)).strip().lower()
+
+
+def _clean(text: str) -> str:
+    return text.replace("<strong>", "").replace("</strong>", "")
+
+
+def format_job(job: dict) -> dict:
+    """Clean one Adzuna result for the frontend."""
+    # Adzuna uses nested dictionaries for company and location
+    company_info = job.get("company", {})
+    location_info = job.get("location", {})
+    return {
+        "id": job.get("id"),
+        "title": _clean(job.get("title", "Job Opportunity")),
+        "company": company_info.get("display_name", "Company Confidential"),
+        "location": location_info.get("display_name", "Remote/Not Specified"),
+        "link": job.get("redirect_url"),
+        "description": _clean(job.get("description", "No description provided.")),
+    }
+
+
+async def _fetch(country: str, query: str, results_per_page: int, page: int, key) -> list:
+    if not COUNTRY_RE.match(country):
+        raise ValueError(f"Invalid country code: {country!r}")
+    app_id, app_key = _credentials()
+    params = {
+        "app_id": app_id,
+        "app_key": app_key,
+        "results_per_page": results_per_page,
+        "what": query,
+        "content-type": "application/json",
+    }
+    with upstream_timer("adzuna") as outcome:
+        response = await get_json(f"{ADZUNA_API_URL}/{country}/search/{page}", params=params, timeout=ADZUNA_TIMEOUT)
+        outcome["status"] = response.status_code
+    if response.status_code != 200:
+        # This will show the exact reason Adzuna is rejecting you
+        logger.error(f"Adzuna API Error ({response.status_code}): {response.text}")
+        raise UpstreamError(response.status_code, response.text)
+
+    jobs = [format_job(job) for job in response.json().get("results", [])]
+    search_cache.set(key, (time.monotonic(), jobs))
+    return jobs
+
+
+def _log_refresh_failure(task):
+    # nobody awaits a background refresh: without this its failure would go unnoticed
+    # while the stale entry keeps being served
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Adzuna background refresh failed: {task.exception()}")
+        count_error("adzuna_refresh", task.exception())
+
+
+async def search_jobs(query: str, country: str = DEFAULT_COUNTRY, results_per_page: int = 10, page: int = 1) -> list:
+    """
+    Formatted Adzuna results for `query`, cached per (country, normalized query,
+    page size, page). Concurrent misses share one upstream call; results past
+    ADZUNA_CACHE_TTL are returned immediately while one background refresh runs.
+    Raises UpstreamError when Adzuna rejects the request.
+    """
+    query = normalize_query(query)
+    key = (country, query, results_per_page, page)
+
+    entry = search_cache.get(key)
+    if entry is not None:
+        fetched_at, jobs = entry
+        if time.monotonic() - fetched_at > ADZUNA_CACHE_TTL:
+            # stale-while-revalidate: refresh in the background, serve what we have
+            _in_flight.start(key, _fetch, country, query, results_per_page, page, key).add_done_callback(
+                _log_refresh_failure)
+        return jobs
+
+    return await _in_flight.do(key, _fetch, country, query, results_per_page, page, key)
+
+
+# -------------------------------
+# Fan-out search
+# -------------------------------
+ADZUNA_FANOUT_CONCURRENCY = int(os.getenv("ADZUNA_FANOUT_CONCURRENCY", "8"))
+
+
+def job_identity(job: dict):
+    """Dedupe key: the Adzuna id when present, else the redirect URL."""
+    return job.get("id") or job.get("link")
+
+
+async def search_many(queries, countries=(DEFAULT_COUNTRY,), pages: int = 1, results_per_page: int = 10,
+                      concurrency: int = ADZUNA_FANOUT_CONCURRENCY) -> list:
+    """
+    Run every (query, country, page) search concurrently, at most `concurrency`
+    at a time, and merge the results into one list without duplicates.
+    Order follows the first query/country/page a job was seen in. Failed
+    searches are skipped; an error is only raised if every search fails.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    combos = [(q, c, p) for q in queries for c in countries for p in range(1, pages + 1)]
+
+    async def run(query, country, page):
+        async with semaphore:
+            return await search_jobs(query, country=country, results_per_page=results_per_page, page=page)
+
+    results = await asyncio.gather(*(run(*combo) for combo in combos), return_exceptions=True)
+
+    merged, seen, errors = [], set(), []
+    for combo, result in zip(combos, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Adzuna search {combo} failed: {result}")
+            errors.append(result)
+            continue
+        for job in result:
+            identity = job_identity(job)
+            if identity is None or identity not in seen:
+                if identity is not None:
+                    seen.add(identity)
+                merged.append(job)
+
+    if errors and len(errors) == len(combos):
+        raise errors[0]
+    return merged
@@ -0,0 +1,98 @@
+import re
+import numpy as np
+from scipy import sparse
+
+from backend.models.keywords import tokenize
+
+# keywords reported per job description
+MAX_MISSING = 15
+# a two-word phrase counts half as much as a single keyword
+BIGRAM_WEIGHT = 0.5
+
+# job-ad filler that says nothing about the candidate's fit
+JD_BOILERPLATE = frozenset("""
+need needs needed plus skill skills experience experienced required requirements require preferred
+strong good excellent knowledge ability abilities years year candidate candidates looking seeking
+job jobs position opportunity responsibilities responsible must nice have hands familiarity
+familiar understanding proven etc ideal join company apply
+""".split())
+
+# bigrams never span punctuation or stopwords: "Django, AWS" / "Kubernetes and AWS" don't pair up
+PHRASE_SPLIT_RE = re.compile(r"[,;:()\[\]|/\n\r\t•]+|\.(?=\s|$)")
+
+
+def extract_keywords(text: str) -> list:
+    """Unigram plus within-phrase bigram keywords ("machine learning", "rest api") of a text."""
+    keywords = []
+    for phrase in PHRASE_SPLIT_RE.split(text or ""):
+        kept = set(tokenize(phrase)) - JD_BOILERPLATE
+        tokens = tokenize(phrase, drop_stopwords=False)
+        keywords.extend(t for t in tokens if t in kept)
+        keywords.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]) if a in kept and b in kept)
+    return keywords
+
+
+def _jd_matrix(job_descriptions):
+    """Sparse (n_jds x vocabulary) keyword weights: sublinear tf * idf across the batch."""
+    vocab, rows, cols, vals = {}, [], [], []
+    for i, jd in enumerate(job_descriptions):
+        counts = {}
+        for kw in extract_keywords(jd):
+            counts[kw] = counts.get(kw, 0) + 1
+        for kw, count in counts.items():
+            rows.append(i)
+            cols.append(vocab.setdefault(kw, len(vocab)))
+            weight = 1.0 + np.log(count)
+            vals.append(weight * BIGRAM_WEIGHT if " " in kw else weight)
+    tf = sparse.csr_matrix(
+        (np.asarray(vals, dtype=np.float64), (rows, cols)),
+        shape=(len(job_descriptions), len(vocab)),
+    )
+    # keywords shared by every JD in a batch (boilerplate) weigh less than distinctive ones
+    df = np.bincount(tf.indices, minlength=len(vocab))
+    idf = np.log1p(len(job_descriptions) / np.maximum(df, 1)) if len(job_descriptions) > 1 else np.ones(len(vocab))
+    return tf @ sparse.diags(idf), vocab
+
+
+def score_resume(resume_text: str, job_descriptions: list) -> list:
+    """
+    Keyword match of one resume against one or many job descriptions.
+
+    For each JD returns `score` (0-100, weighted share of JD keywords present in
+    the resume), `coverage` (unweighted share), and the matched / missing
+    keywords, heaviest first.
+    """
+    if not job_descriptions:
+        return []
+
+    weights, vocab = _jd_matrix(job_descriptions)
+    terms = np.empty(len(vocab), dtype=object)
+    for kw, idx in vocab.items():
+        terms[idx] = kw
+
+    resume_keywords = set(extract_keywords(resume_text))
+    present = np.zeros(len(vocab), dtype=np.float64)
+    present[[idx for kw, idx in vocab.items() if kw in resume_keywords]] = 1.0
+
+    # all JDs at once: weighted and unweighted overlap with the resume
+    matched_weight = weights @ present
+    total_weight = np.asarray(weights.sum(axis=1)).ravel()
+    binary = weights.copy()
+    binary.data[:] = 1.0
+    matched_count = binary @ present
+    total_count = np.diff(weights.indptr)
+
+    results = []
+    for i in range(len(job_descriptions)):
+        start, end = weights.indptr[i], weights.indptr[i + 1]
+        idx, w = weights.indices[start:end], weights.data[start:end]
+        order = np.argsort(-w, kind="stable")
+        idx, hit = idx[order], present[idx[order]] > 0
+        results.append({
+            "score": round(float(100.0 * matched_weight[i] / total_weight[i]), 1) if total_weight[i] else 0.0,
+            "coverage": round(float(matched_count[i] / total_count[i]), 4) if total_count[i] else 0.0,
+            "keywords": int(total_count[i]),
+            "matched_keywords": terms[idx[hit]][:MAX_MISSING].tolist(),
+            "missing_keywords": terms[idx[~hit]][:MAX_MISSING].tolist(),
+        })
+    return results
@@ -0,0 +1,235 @@
+import os
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+BLOB_DIR = os.getenv("BLOB_DIR", str(Path(__file__).resolve().parent.parent / "uploads" / "blobs"))
+# unreferenced blobs are deleted this long after their last use
+BLOB_MAX_AGE = float(os.getenv("BLOB_MAX_AGE", str(7 * 24 * 3600)))
+# above this, unreferenced blobs are deleted oldest-first even if younger
+BLOB_MAX_MB = float(os.getenv("BLOB_MAX_MB", "1024"))
+BLOB_GC_INTERVAL = float(os.getenv("BLOB_GC_INTERVAL", "300"))
+# half-written temp files older than this are leftovers from a crash
+BLOB_TMP_MAX_AGE = 3600
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobStore:
+    """
+    Content-addressed file store: each distinct file is kept once under
+    root/ab/cd/<sha256>, however many times or names it was uploaded with.
+
+    An SQLite index next to the files holds size, reference count and last
+    use per blob. put_bytes takes a reference (unless ref=False) that the
+    holder gives back with decref; gc() only ever deletes blobs with no
+    references, first those unused for `max_age` seconds, then the least
+    recently used until the store is under `max_bytes`.
+
+    Several worker processes may share one store: every check-and-update of
+    the index, and every file move or delete that depends on it, happens in
+    one `BEGIN IMMEDIATE` transaction, whose write lock (unlike `_lock`)
+    spans processes.
+    """
+
+    def __init__(self, root: str, max_age: float = BLOB_MAX_AGE, max_bytes: int = int(BLOB_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.tmp_dir = os.path.join(root, "tmp")
+        # guards the shared connection between threads; re-entered by open()
+        self._lock = threading.RLock()
+        self._db = None
+        self._gc_task = None
+
+    def open(self):
+        """Create the directories and index (called on app startup rather than at import; idempotent)."""
+        with self._lock:
+            if self._db is not None:
+                return
+            os.makedirs(self.tmp_dir, exist_ok=True)
+            db = sqlite3.connect(os.path.join(self.root, "index.db"), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " digest TEXT PRIMARY KEY, size INTEGER NOT NULL, refcount INTEGER NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS blobs_gc ON blobs (refcount, last_used_at)")
+            self._db = db
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.open()
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    # ---- paths ----
+    def path(self, digest: str) -> str:
+        if not DIGEST_RE.match(digest or ""):
+            raise ValueError(f"not a blob digest: {digest!r}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    # ---- writes ----
+    def put_bytes(self, data: bytes, ref: bool = True, digest: str = None) -> str:
+        """Store `data` (pass `digest` if its sha256 is already known); returns the digest."""
+        digest = digest or hashlib.sha256(data).hexdigest()
+        if self._touch_existing(digest, ref):
+            return digest
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        return self._commit(tmp_path, digest, len(data), ref)
+
+    def _touch_existing(self, digest: str, ref: bool) -> bool:
+        """Take the reference on an already stored blob; False (and nothing counted) if it isn't."""
+        with self._transaction() as db:
+            # GC deletes the row before the file, both under the same write lock,
+            # so a row plus a file here means the blob stays
+            if not os.path.exists(self.path(digest)):
+                return False
+            updated = db.execute(
+                "UPDATE blobs SET refcount = refcount + ?, last_used_at = ? WHERE digest = ?",
+                (int(ref), time.time(), digest),
+            ).rowcount
+            return updated == 1
+
+    def _commit(self, tmp_path: str, digest: str, size: int, ref: bool) -> str:
+        final_path = self.path(digest)
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute("SELECT refcount FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if row is not None and os.path.exists(final_path):
+                # already stored: drop the duplicate bytes
+                os.remove(tmp_path)
+                db.execute(
+                    "UPDATE blobs SET refcount = refcount + ?, last_used_at = ? WHERE digest = ?",
+                    (int(ref), now, digest),
+                )
+                return digest
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+            db.execute(
+                "INSERT INTO blobs (digest, size, refcount, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(digest) DO UPDATE SET size = excluded.size,"
+                " refcount = refcount + excluded.refcount, last_used_at = excluded.last_used_at",
+                (digest, size, int(ref), now, now),
+            )
+        return digest
+
+    # ---- references ----
+    def decref(self, digest: str):
+        """Release one reference; the blob becomes eligible for GC at zero."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE blobs SET refcount = MAX(refcount - 1, 0), last_used_at = ? WHERE digest = ?",
+                (time.time(), digest),
+            )
+
+    def read(self, digest: str) -> bytes:
+        with open(self.path(digest), "rb") as f:
+            return f.read()
+
+    # ---- garbage collection ----
+    def gc(self) -> dict:
+        now = time.time()
+        removed = freed = 0
+        with self._lock:
+            self.open()
+            expired = self._db.execute(
+                "SELECT digest, size FROM blobs WHERE refcount = 0 AND last_used_at < ?", (now - self.max_age,)
+            ).fetchall()
+            for digest, size in expired:
+                if self._delete_unreferenced(digest, now - self.max_age):
+                    removed, freed = removed + 1, freed + size
+
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total > self.max_bytes:
+                for digest, size in self._db.execute(
+                    "SELECT digest, size FROM blobs WHERE refcount = 0 ORDER BY last_used_at"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    if self._delete_unreferenced(digest):
+                        removed, freed, total = removed + 1, freed + size, total - size
+
+        for name in os.listdir(self.tmp_dir):
+            tmp_path = os.path.join(self.tmp_dir, name)
+            try:
+                if os.path.getmtime(tmp_path) < now - BLOB_TMP_MAX_AGE:
+                    os.remove(tmp_path)
+            except OSError:
+                pass
+
+        if removed:
+            logger.info(f"Blob GC removed {removed} blobs ({freed / 1024 / 1024:.1f} MB), {total / 1024 / 1024:.1f} MB left")
+        return {"removed": removed, "freed_bytes": freed, "total_bytes": total}
+
+    def _delete_unreferenced(self, digest: str, used_before: float = None) -> bool:
+        """Delete the blob if it is still unreferenced (and unused since `used_before`) now, in this transaction."""
+        with self._transaction() as db:
+            # another process may have taken a reference since the candidates were listed
+            deleted = db.execute(
+                "DELETE FROM blobs WHERE digest = ? AND refcount = 0 AND last_used_at < ?",
+                (digest, time.time() if used_before is None else used_before),
+            ).rowcount
+            if deleted:
+                try:
+                    os.remove(self.path(digest))
+                except FileNotFoundError:
+                    pass
+            return deleted == 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            self.open()
+            count, total, referenced = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(refcount > 0), 0) FROM blobs"
+            ).fetchone()
+        return {"blobs": count, "total_bytes": total, "referenced": referenced}
+
+    # ---- background collector ----
+    def start_gc(self, interval: float = BLOB_GC_INTERVAL):
+        if self._gc_task is None:
+            self._gc_task = asyncio.create_task(self._gc_loop(interval))
+
+    async def stop_gc(self):
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            await asyncio.gather(self._gc_task, return_exceptions=True)
+            self._gc_task = None
+
+    async def _gc_loop(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # file deletes can be slow on a big store: keep them off the event loop
+                await loop.run_in_executor(None, self.gc)
+            except Exception:
+                logger.exception("Blob GC failed")
+            await asyncio.sleep(interval)
+
+
+# one store for resumes, job inputs and profile images
+blob_store = BlobStore(BLOB_DIR)
@@ -0,0 +1,202 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+EXTRACTION_CACHE_ENTRIES = int(os.getenv("EXTRACTION_CACHE_ENTRIES", "256"))
+# leave EXTRACTION_CACHE_DIR unset to keep the cache memory-only
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR")
+EXTRACTION_CACHE_MAX_MB = float(os.getenv("EXTRACTION_CACHE_MAX_MB", "200"))
+
+
+def content_key(data: bytes, kind: str, digest: str = None) -> str:
+    """Cache key for one extractor's output on one PDF: '<kind>-<sha256 of bytes>'.
+    Pass `digest` when the sha256 is already known (e.g. computed during upload)."""
+    return f"{kind}-{digest or hashlib.sha256(data).hexdigest()}"
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of extracted PDF text, keyed by content hash.
+
+    - memory: LRU of at most `max_entries` strings
+    - disk (optional): one file per key under `disk_dir`, oldest-accessed
+      files are deleted once the tier grows past `disk_max_bytes`
+
+    On the event loop use aget/aput: memory hits are answered inline and
+    disk reads, writes and eviction run in a thread. get/put are for scripts
+    and worker processes.
+    """
+
+    def __init__(self, max_entries=256, disk_dir=None, disk_max_bytes=200 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # disk writes and eviction; never held together with _lock's memory lookups
+        self._disk_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    # ---- disk tier helpers ----
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[-2:], f"{key}.txt")
+
+    def _disk_entries(self):
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_mtime, st.st_size
+
+    def _disk_get(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            os.utime(path)  # mark as recently used for eviction
+            return value
+        except OSError:
+            return None
+
+    def _disk_put(self, key, value):
+        path = self._disk_path(key)
+        data = value.encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            return
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self._disk_bytes += len(data)
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        # drop least recently used files until we're back under 90% of the limit
+        entries = sorted(self._disk_entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        target = self.disk_max_bytes * 0.9
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    # ---- tiers ----
+    def _memory_get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def _disk_lookup(self, key):
+        """Disk tier after a memory miss; counts the lookup as a hit or miss."""
+        value = self._disk_get(key) if self.disk_dir else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, value)
+        return value
+
+    def _disk_store(self, key, value):
+        try:
+            with self._disk_lock:
+                self._disk_put(key, value)
+        except OSError as e:
+            print(f"Extraction cache disk write failed: {e}")
+
+    # ---- public API ----
+    def get(self, key):
+        value = self._memory_get(key)
+        if value is None:
+            value = self._disk_lookup(key)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_dir:
+            self._disk_store(key, value)
+
+    async def aget(self, key):
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        if self.disk_dir:
+            return await run_in_threadpool(self._disk_lookup, key)
+        return self._disk_lookup(key)
+
+    async def aput(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_dir:
+            await run_in_threadpool(self._disk_store, key, value)
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_or_extract(self, data: bytes, kind: str, extract, digest: str = None):
+        """Return cached output for `data`, or run `extract(data)` and cache a non-empty result."""
+        key = content_key(data, kind, digest)
+        value = self.get(key)
+        if value is None:
+            value = extract(data)
+            if value:
+                self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+
+# shared instance used by pdf_converter and resume_parser
+extraction_cache = ExtractionCache(
+    max_entries=EXTRACTION_CACHE_ENTRIES,
+    disk_dir=EXTRACTION_CACHE_DIR,
+    disk_max_bytes=int(EXTRACTION_CACHE_MAX_MB * 1024 * 1024),
+)
@@ -1,5 +1,8 @@
 import os
-import requests
+import re
+import logging
+from backend.models.llm_gateway import gateway
+from backend.models.prompt_compact import compact_resume
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -7,7 +10,19 @@ from pathlib import Path
 env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-def get_job_search_query(resume_text: str):
+logger = logging.getLogger(__name__)
+
+# the query is tiny, so don't let a slow completion hold up /suggest-jobs/
+QUERY_TIMEOUT = float(os.getenv("GROQ_QUERY_TIMEOUT", "15"))
+# a few keywords don't need the whole resume: summary/skills/experience are kept first
+QUERY_TOKEN_BUDGET = int(os.getenv("QUERY_TOKEN_BUDGET", "800"))
+
+def _resume_for_query(resume_text: str) -> str:
+    resume = compact_resume(resume_text, token_budget=QUERY_TOKEN_BUDGET or None)
+    logger.info(f"Job query prompt: resume ~{resume.original_tokens} -> {resume.tokens} tokens")
+    return resume.text
+
+async def get_job_search_query(resume_text: str):
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         return "Software Engineer" # Fallback if key is missing
@@ -18,28 +33,52 @@ def get_job_search_query(resume_text: str):
     Return ONLY the keywords. No quotes, no explanation.
     
     Resume:
-    {resume_text}
+    {_resume_for_query(resume_text)}
     """
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": "llama-3.3-70b-versatile",
-        "messages": [{"role": "user", "content": prompt}],
-    }
+    messages = [{"role": "user", "content": prompt}]
 
     try:
-        response = requests.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=payload)
-        res_data = response.json()
-        
-        if "choices" in res_data:
-            query = res_data["choices"][0]["message"]["content"]
-            # Force result to be a clean string
-            return str(query).strip().replace('"', '')
+        query = await gateway.chat(messages, timeout=QUERY_TIMEOUT, expected_output_tokens=20)
+        # Force result to be a clean string
+        return str(query).strip().replace('"', '')
+    except Exception as e:
+        print(f"Groq Error: {e}")
         return "Software Engineer"
+
+async def get_job_search_queries(resume_text: str, count: int = 3):
+    """
+    Ask for `count` distinct job-board queries (e.g. different roles or
+    stacks the resume fits), used to fan out one search into several.
+    Always returns at least one query.
+    """
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key or count <= 1:
+        return [await get_job_search_query(resume_text)]
+
+    prompt = f"""
+    Analyze the following resume and generate {count} different short search queries
+    (3-5 words each) for a job board, each targeting a different role or skill set
+    the candidate is strong in.
+    Return ONLY the queries, one per line. No numbering, no quotes, no explanation.
+    
+    Resume:
+    {_resume_for_query(resume_text)}
+    """
+
+    messages = [{"role": "user", "content": prompt}]
+
+    try:
+        content = await gateway.chat(messages, timeout=QUERY_TIMEOUT, expected_output_tokens=20 * count)
+        queries = []
+        for line in str(content).splitlines():
+            # drop list markers ("1.", "-", "*") the model adds despite being asked not to
+            query = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line).replace('"', '').strip()
+            if query and query.lower() not in (q.lower() for q in queries):
+                queries.append(query)
+        if queries:
+            return queries[:count]
+        return ["Software Engineer"]
     except Exception as e:
         print(f"Groq Error: {e}")
-        return "Software Engineer"
\ No newline at end of file
+        return ["Software Engineer"]
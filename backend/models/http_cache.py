@@ -0,0 +1,39 @@
+from email.utils import formatdate, parsedate_to_datetime
+
+# -------------------------------
+# Conditional GET helpers (ETag / Last-Modified -> 304)
+# -------------------------------
+# for URLs whose content never changes (content-hashed names)
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(request_headers, etag: str = None, last_modified: float = None) -> bool:
+    """
+    True when the client's cached copy is current. If-None-Match wins over
+    If-Modified-Since when both are sent.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return int(last_modified) <= since
+    return False
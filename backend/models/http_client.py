@@ -0,0 +1,144 @@
+import os
+import json
+import asyncio
+import httpx
+from dotenv import load_dotenv
+from pathlib import Path
+
+# load backend/.env before reading settings below
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+# -------------------------------
+# Upstream endpoints
+# -------------------------------
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_MODEL = "llama-3.3-70b-versatile"
+
+# -------------------------------
+# Pool / concurrency settings (override via .env)
+# -------------------------------
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
+# max upstream calls in flight per worker, across all routes
+HTTP_MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", "32"))
+
+_client = None
+_client_loop = None
+_semaphore = None
+
+
+def _make_timeout(timeout):
+    return httpx.Timeout(timeout, connect=min(HTTP_CONNECT_TIMEOUT, timeout))
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared keep-alive AsyncClient for the running event loop.
+    A new client is created if none exists yet or it belongs to another loop
+    (e.g. scripts calling asyncio.run more than once).
+    """
+    global _client, _client_loop, _semaphore
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=_make_timeout(HTTP_DEFAULT_TIMEOUT),
+        )
+        _client_loop = loop
+        _semaphore = asyncio.Semaphore(HTTP_MAX_CONCURRENCY)
+    return _client
+
+
+async def close_client():
+    """Close the shared client (called on app shutdown)."""
+    global _client, _client_loop, _semaphore
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+    _semaphore = None
+
+
+async def request(method: str, url: str, timeout: float = None, **kwargs) -> httpx.Response:
+    """
+    Send a request through the shared pool, bounded by HTTP_MAX_CONCURRENCY.
+    Raises httpx.TimeoutException / httpx.HTTPError on transport failures.
+    """
+    client = get_client()
+    if timeout is not None:
+        kwargs["timeout"] = _make_timeout(timeout)
+    async with _semaphore:
+        return await client.request(method, url, **kwargs)
+
+
+async def get_json(url: str, params: dict = None, timeout: float = None) -> httpx.Response:
+    return await request("GET", url, params=params, timeout=timeout)
+
+
+async def post_json(url: str, payload: dict, headers: dict = None, timeout: float = None) -> httpx.Response:
+    return await request("POST", url, json=payload, headers=headers, timeout=timeout)
+
+
+class UpstreamError(Exception):
+    """Non-200 answer from an upstream API; `headers` are the response's (e.g. for Retry-After)."""
+
+    def __init__(self, status_code: int, detail: str, headers=None):
+        super().__init__(f"upstream returned {status_code}: {detail[:200]}")
+        self.status_code = status_code
+        self.detail = detail
+        self.headers = headers if headers is not None else {}
+
+
+# -------------------------------
+# Groq helpers
+# -------------------------------
+def groq_headers(api_key: str) -> dict:
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+async def groq_chat(api_key: str, messages: list, model: str = GROQ_MODEL, timeout: float = None, **extra) -> httpx.Response:
+    """POST a chat completion to Groq's OpenAI-compatible endpoint and return the raw response."""
+    payload = {"model": model, "messages": messages, **extra}
+    return await post_json(GROQ_API_URL, payload, headers=groq_headers(api_key), timeout=timeout)
+
+
+async def groq_chat_stream(api_key: str, messages: list, model: str = GROQ_MODEL, timeout: float = None, **extra):
+    """
+    Stream a chat completion, yielding content deltas as Groq sends them.
+    `timeout` bounds the wait for each chunk rather than the whole reply.
+    Closing the generator early (e.g. client disconnect) closes the upstream stream.
+    """
+    client = get_client()
+    payload = {"model": model, "messages": messages, "stream": True, **extra}
+    kwargs = {"timeout": _make_timeout(timeout)} if timeout is not None else {}
+    async with _semaphore:
+        async with client.stream("POST", GROQ_API_URL, json=payload, headers=groq_headers(api_key), **kwargs) as resp:
+            if resp.status_code != 200:
+                body = await resp.aread()
+                raise UpstreamError(resp.status_code, body.decode("utf-8", "replace"), resp.headers)
+            done = False
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    done = True
+                    break
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+            if not done:
+                # connection closed mid-reply: a truncated answer must not pass for a complete one
+                raise UpstreamError(502, "AI service stream ended before completion")
@@ -0,0 +1,105 @@
+import os
+import hashlib
+import fitz  # PyMuPDF
+from dotenv import load_dotenv
+from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", "10"))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+
+READ_CHUNK = 256 * 1024
+PDF_MAGIC = b"%PDF-"
+# readers accept the header anywhere in the first 1 KB (some generators prepend junk)
+MAGIC_WINDOW = 1024
+
+
+class UploadRejected(Exception):
+    """The upload is too large, not a PDF, or has too many pages."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class PDFUpload:
+    """A validated PDF held in memory, with the sha256 computed while reading it."""
+
+    __slots__ = ("data", "digest", "size", "pages", "filename")
+
+    def __init__(self, data: bytes, digest: str, pages: int, filename: str = None):
+        self.data = data
+        self.digest = digest
+        self.size = len(data)
+        self.pages = pages
+        self.filename = filename
+
+
+def count_pages(data: bytes) -> int:
+    """Open the in-memory PDF (no temp file) just far enough to count its pages."""
+    try:
+        doc = fitz.open(stream=data, filetype="pdf")
+    except Exception as e:
+        raise UploadRejected(422, f"Could not open PDF: {e}")
+    with doc:
+        if doc.needs_pass:
+            raise UploadRejected(422, "Encrypted PDFs are not supported")
+        return doc.page_count
+
+
+def _check_pdf_header(head: bytes):
+    if PDF_MAGIC not in head:
+        raise UploadRejected(415, "File is not a PDF")
+
+
+async def read_upload(file, max_bytes: int, check_head=None):
+    """
+    Read an UploadFile in one pass, hashing as it goes and stopping as soon as
+    it exceeds `max_bytes` (413). `check_head(first_bytes)` sees the first
+    MAGIC_WINDOW bytes as soon as they arrive and may raise UploadRejected.
+    Returns (data, sha256 hex digest).
+    """
+    sha = hashlib.sha256()
+    chunks, size, head = [], 0, b""
+    while True:
+        chunk = await file.read(READ_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadRejected(413, f"File is larger than {max_bytes / (1024 * 1024):g} MB")
+        if check_head is not None and len(head) < MAGIC_WINDOW:
+            head += chunk[:MAGIC_WINDOW - len(head)]
+            if len(head) == MAGIC_WINDOW:
+                check_head(head)
+        sha.update(chunk)
+        chunks.append(chunk)
+
+    if check_head is not None and len(head) < MAGIC_WINDOW:
+        # shorter than the window: check what there is
+        check_head(head)
+    data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    return data, sha.hexdigest()
+
+
+async def read_pdf_upload(file, max_bytes: int = None, max_pages: int = None) -> PDFUpload:
+    """
+    Read an UploadFile in one pass: hash it, stop as soon as it exceeds
+    `max_bytes`, and reject it if the PDF header is missing, before PyMuPDF
+    ever sees it. Then check the page count against `max_pages`.
+    Raises UploadRejected (413 too large, 415 not a PDF, 422 unreadable).
+    """
+    max_bytes = int(MAX_UPLOAD_MB * 1024 * 1024) if max_bytes is None else max_bytes
+    max_pages = MAX_PDF_PAGES if max_pages is None else max_pages
+
+    data, digest = await read_upload(file, max_bytes, _check_pdf_header)
+    pages = await run_in_threadpool(count_pages, data)
+    if pages > max_pages:
+        raise UploadRejected(413, f"PDF has {pages} pages, the limit is {max_pages}")
+    return PDFUpload(data, digest, pages, getattr(file, "filename", None))
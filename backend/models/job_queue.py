@@ -0,0 +1,194 @@
+import os
+import time
+import math
+import asyncio
+import logging
+from uuid import uuid4
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+# finished jobs (and their inputs) are kept this long for polling/download
+JOB_TTL = float(os.getenv("JOB_TTL", "3600"))
+JOB_CLEANUP_INTERVAL = float(os.getenv("JOB_CLEANUP_INTERVAL", "60"))
+# a job hitting a transient capacity error (retry_on) waits and retries, backing off up to this
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "10"))
+JOB_RETRY_BASE_DELAY = 0.5
+
+# job stages, in pipeline order
+QUEUED = "queued"
+EXTRACTING = "extracting"
+OPTIMIZING = "optimizing"
+RENDERING = "rendering"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Raised by submit() when the queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"job queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, **params):
+        self.id = uuid4().hex
+        self.params = params
+        self.stage = QUEUED
+        self.error = None
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.stage in (DONE, FAILED)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "stage": self.stage,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.finished_at + JOB_TTL if self.finished_at else None,
+        }
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue served by a fixed set of asyncio workers.
+
+    `handler(job)` is awaited for each job and may update `job.stage` as it
+    goes; its return value is stored on `job.result`. An exception listed in
+    `retry_on` (e.g. a saturated worker pool) doesn't fail the job: the
+    handler is retried with backoff until capacity frees up. Finished jobs are
+    dropped `ttl` seconds after completion, awaiting `on_expire(job)` so the
+    caller can release whatever the job holds (blocking work belongs in a
+    thread, not on the loop); stop() does the same for every job it still has.
+    """
+
+    def __init__(self, handler, workers=JOB_WORKERS, maxsize=JOB_QUEUE_SIZE, ttl=JOB_TTL, on_expire=None,
+                 retry_on=()):
+        self.handler = handler
+        self.on_expire = on_expire
+        self.retry_on = tuple(retry_on)
+        self.workers = workers
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.jobs = {}
+        self._queue = None
+        self._tasks = []
+        self._avg_seconds = 10.0  # EWMA of job run time, seeds Retry-After
+
+    # ---- lifecycle ----
+    def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._cleanup_loop()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # queued and unexpired jobs die with the process: release what they hold
+        # (e.g. blob refs, which outlive it) instead of leaking it
+        for job in list(self.jobs.values()):
+            await self._release(job)
+        self.jobs.clear()
+
+    # ---- public API ----
+    def backlog(self) -> int:
+        """Jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue else 0
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.backlog() * self._avg_seconds / max(self.workers, 1)))
+
+    def full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    def submit(self, job: Job) -> Job:
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(self.retry_after())
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def queue_position(self, job: Job) -> int:
+        if job.stage != QUEUED:
+            return 0
+        return sum(1 for j in self.jobs.values() if j.stage == QUEUED and j.created_at <= job.created_at)
+
+    # ---- internals ----
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            job.started_at = time.time()
+            try:
+                job.result = await self._run(job)
+                job.stage = DONE
+            except asyncio.CancelledError:
+                job.stage, job.error = FAILED, "cancelled"
+                raise
+            except Exception as e:
+                logger.exception(f"Job {job.id} failed")
+                job.stage, job.error = FAILED, str(e)
+            finally:
+                job.finished_at = time.time()
+                elapsed = job.finished_at - job.started_at
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        delay = JOB_RETRY_BASE_DELAY
+        while True:
+            try:
+                return await self.handler(job)
+            except self.retry_on as e:
+                # the job was accepted: wait for capacity instead of failing it
+                logger.warning(f"Job {job.id} deferred ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, JOB_RETRY_MAX_DELAY)
+
+    async def _cleanup_loop(self):
+        while True:
+            await asyncio.sleep(JOB_CLEANUP_INTERVAL)
+            await self.cleanup()
+
+    async def cleanup(self):
+        now = time.time()
+        expired = [j for j in self.jobs.values() if j.finished and j.finished_at + self.ttl < now]
+        for job in expired:
+            self.jobs.pop(job.id, None)
+            await self._release(job)
+        if expired:
+            logger.info(f"Expired {len(expired)} finished jobs")
+
+    async def _release(self, job: Job):
+        if self.on_expire is not None:
+            try:
+                await self.on_expire(job)
+            except Exception:
+                logger.exception(f"Releasing job {job.id} failed")
@@ -0,0 +1,23 @@
+import re
+
+# tokens keep tech-name punctuation: "c++", "c#", "node.js", "ci/cd" -> "ci", "cd"
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own per same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up us very via was we were what when where
+which while who whom why will with within without would you your yours yourself yourselves
+able across well using use used new work working including include includes ensure role
+""".split())
+
+
+def tokenize(text: str, drop_stopwords: bool = True) -> list:
+    """Lowercase word tokens for matching; stopwords and 1-char tokens are dropped by default."""
+    tokens = TOKEN_RE.findall((text or "").lower())
+    if not drop_stopwords:
+        return tokens
+    return [t for t in tokens if len(t) > 1 and t not in STOPWORDS]
@@ -1,8 +1,35 @@
 import os
-from groq import Groq
+import re
+import asyncio
+import hashlib
+import logging
 from dotenv import load_dotenv
+from backend.models.cache import TTLCache, AsyncSingleFlight
+from backend.models.llm_gateway import gateway, CircuitOpenError, DEFAULT
+from backend.models.prompt_compact import compact_resume, compact_text, estimate_tokens
 load_dotenv(dotenv_path="backend/.env")
 
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "llama-3.3-70b-versatile"
+
+# bump whenever PROMPT_TEMPLATE changes so stale cached answers aren't served
+PROMPT_VERSION = "2"
+
+# max estimated tokens of resume text sent to the model; lowest-priority
+# sections are dropped/trimmed beyond this (0 disables the budget)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+
+# identical (resume, job description) pairs reuse the previous completion
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_ENTRIES = int(os.getenv("LLM_CACHE_ENTRIES", "512"))
+
+# a rewritten resume is long: budget this many output tokens against the TPM limit
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "1500"))
+
+result_cache = TTLCache(max_entries=LLM_CACHE_ENTRIES, ttl=LLM_CACHE_TTL)
+_in_flight = AsyncSingleFlight()
 
 PROMPT_TEMPLATE = """
 You are a professional resume optimizer specializing in creating ATS-friendly Markdown resumes. I have a resume in Markdown and a job description. Optimize the resume to align precisely with the job requirements and return a well-structured Markdown document with clearly defined sections.
@@ -49,37 +76,106 @@ You are a professional resume optimizer specializing in creating ATS-friendly Ma
 Provide the optimized resume in Markdown format with the structure and guidelines above.
 """
 
-def generate_optimized_resume(md_resume: str, job_description: str) -> str:
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+def cache_key(md_resume: str, job_description: str, model: str = MODEL_NAME) -> str:
+    """Key a completion on normalized inputs, model and prompt version."""
+    parts = [PROMPT_VERSION, model, _normalize(md_resume), _normalize(job_description)]
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+def build_messages(md_resume: str, job_description: str) -> list:
+    """Chat messages for one optimization, with the resume compacted to PROMPT_TOKEN_BUDGET."""
+    resume = compact_resume(md_resume, token_budget=PROMPT_TOKEN_BUDGET or None)
+    prompt = PROMPT_TEMPLATE.format(md_resume=resume.text, job_description=compact_text(job_description))
+    logger.info(
+        f"Optimization prompt ~{estimate_tokens(prompt)} input tokens "
+        f"(resume {resume.original_tokens} -> {resume.tokens}{', truncated' if resume.truncated else ''})"
+    )
+    return [
+        {"role": "system", "content": "You are a highly skilled Markdown resume optimizer."},
+        {"role": "user", "content": prompt},
+    ]
+
+async def agenerate_optimized_resume(md_resume: str, job_description: str, priority: int = DEFAULT) -> str:
     """
-    Calls the Groq API to generate an optimized resume in Markdown format.
+    Calls the Groq API (through the LLM gateway) to generate an optimized resume in Markdown format.
+
+    Results are cached per (resume, job description, model, prompt version),
+    and concurrent identical requests share a single upstream call.
 
     Args:
         md_resume (str): The user's resume in Markdown format.
         job_description (str): The job description for optimization.
+        priority (int): llm_gateway.INTERACTIVE / DEFAULT / BATCH.
 
     Returns:
         str: The optimized resume in Markdown format.
     """
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY is not set in environment variables.")
+    key = cache_key(md_resume, job_description)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached
 
-    client = Groq(api_key=api_key)
+    return await _in_flight.do(key, _generate_and_cache, key, md_resume, job_description, priority)
 
+async def _generate_and_cache(key: str, md_resume: str, job_description: str, priority: int) -> str:
     try:
-        response = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": "You are a highly skilled Markdown resume optimizer."},
-                {"role": "user", "content": PROMPT_TEMPLATE.format(md_resume=md_resume, job_description=job_description)},
-            ],
-            model="llama-3.3-70b-versatile",
+        optimized = await gateway.chat(
+            build_messages(md_resume, job_description),
+            model=MODEL_NAME,
+            priority=priority,
+            timeout=LLM_TIMEOUT,
+            expected_output_tokens=EXPECTED_OUTPUT_TOKENS,
         )
-
-        return response.choices[0].message.content.strip()
-
+    except (CircuitOpenError, ValueError):
+        # "come back later" and "misconfigured" are worth surfacing as-is
+        raise
     except Exception as e:
         raise RuntimeError("An error occurred while processing your request") from e
 
+    if optimized:
+        # an empty reply is a failed generation, not an answer to replay for the whole TTL
+        result_cache.set(key, optimized)
+    return optimized
+
+def generate_optimized_resume(md_resume: str, job_description: str) -> str:
+    """Blocking wrapper around agenerate_optimized_resume for scripts (not for use inside the app's event loop)."""
+    return asyncio.run(agenerate_optimized_resume(md_resume, job_description))
+
+async def stream_optimized_resume(md_resume: str, job_description: str, priority: int = DEFAULT):
+    """
+    Async generator yielding the optimized Markdown as it is generated.
+    A cached result is yielded in one piece; a completed, non-empty stream
+    is cached so a follow-up /upload/ for the same pair doesn't call Groq again.
+    """
+    key = cache_key(md_resume, job_description)
+    cached = result_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    tokens = gateway.stream(
+        build_messages(md_resume, job_description),
+        model=MODEL_NAME,
+        priority=priority,
+        timeout=LLM_TIMEOUT,
+        expected_output_tokens=EXPECTED_OUTPUT_TOKENS,
+    )
+    try:
+        async for token in tokens:
+            parts.append(token)
+            yield token
+    finally:
+        await tokens.aclose()
+
+    # only reached when the stream ran to completion (errors and disconnects raise above);
+    # an empty reply would otherwise be replayed for the whole TTL
+    text = "".join(parts).strip()
+    if text:
+        result_cache.set(key, text)
+
 if __name__ == "__main__":
     sample_md_resume = """
     ## Professional Overview
@@ -0,0 +1,346 @@
+import os
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import logging
+import httpx
+from dotenv import load_dotenv
+from pathlib import Path
+
+from backend.models.http_client import GROQ_MODEL, UpstreamError, groq_chat, groq_chat_stream
+from backend.models.prompt_compact import estimate_tokens
+from backend.models.metrics import upstream_timer
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+GROQ_RPM = float(os.getenv("GROQ_RPM", "30"))
+GROQ_TPM = float(os.getenv("GROQ_TPM", "12000"))
+# share of both buckets that batch callers may not dip into
+GROQ_INTERACTIVE_RESERVE = float(os.getenv("GROQ_INTERACTIVE_RESERVE", "0.2"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "3"))
+GROQ_BACKOFF_BASE = float(os.getenv("GROQ_BACKOFF_BASE", "0.5"))
+GROQ_BACKOFF_MAX = float(os.getenv("GROQ_BACKOFF_MAX", "20"))
+GROQ_BREAKER_FAILURES = int(os.getenv("GROQ_BREAKER_FAILURES", "5"))
+GROQ_BREAKER_RESET = float(os.getenv("GROQ_BREAKER_RESET", "30"))
+
+# caller priorities, lower is served first
+INTERACTIVE = 0   # chatbot
+DEFAULT = 1       # single /upload/, job search queries
+BATCH = 2         # /jobs/ and /upload/batch
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Groq has been failing; calls are rejected until the breaker's cool-down ends."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM service unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+# -------------------------------
+# Rate limiting
+# -------------------------------
+class RateLimiter:
+    """
+    Two token buckets (requests/min and LLM tokens/min) with a priority queue
+    of waiters: whoever has the lowest priority value is served first, and
+    BATCH callers leave `reserve` of each bucket for interactive traffic.
+    """
+
+    def __init__(self, rpm: float, tpm: float, reserve: float = 0.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.reserve = reserve
+        self._requests = rpm
+        self._tokens = tpm
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = None
+        self._cond_loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def _condition(self) -> asyncio.Condition:
+        """
+        The Condition for the running event loop, created on first use there.
+        Scripts call asyncio.run more than once (generate_optimized_resume), and
+        a Condition must not be shared between loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._cond_loop is not loop:
+            self._cond, self._cond_loop = asyncio.Condition(), loop
+            # waiters from a finished loop can never be woken
+            self._waiters = []
+        return self._cond
+
+    def _floor(self, priority, capacity):
+        return capacity * self.reserve if priority >= BATCH else 0.0
+
+    def _wait_time(self, tokens, priority):
+        need_requests = 1 + self._floor(priority, self.rpm) - self._requests
+        need_tokens = tokens + self._floor(priority, self.tpm) - self._tokens
+        return max(need_requests * 60.0 / self.rpm, need_tokens * 60.0 / self.tpm, 0.01)
+
+    async def acquire(self, tokens: int = 0, priority: int = DEFAULT):
+        tokens = min(tokens, self.tpm * (1 - self.reserve))  # never ask for more than the bucket can hold
+        entry = [priority, next(self._seq)]
+        cond = self._condition()
+        async with cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    self._refill()
+                    head = self._waiters[0] is entry
+                    if (head and self._requests - 1 >= self._floor(priority, self.rpm)
+                            and self._tokens - tokens >= self._floor(priority, self.tpm)):
+                        heapq.heappop(self._waiters)
+                        self._requests -= 1
+                        self._tokens -= tokens
+                        cond.notify_all()
+                        return
+                    timeout = self._wait_time(tokens, priority) if head else None
+                    try:
+                        await asyncio.wait_for(cond.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    cond.notify_all()
+                raise
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def adjust_tokens(self, delta: float):
+        """Correct the token bucket once the real usage of a call is known."""
+        self._tokens = min(self.tpm, self._tokens - delta)
+
+    def drain(self, seconds: float):
+        """Upstream said 429: stop granting for about `seconds`."""
+        self._refill()
+        self._requests = min(self._requests, -seconds * self.rpm / 60.0)
+
+
+# -------------------------------
+# Circuit breaker
+# -------------------------------
+class CircuitBreaker:
+    """
+    closed -> open after `failures` consecutive failures; open -> half-open
+    after `reset_timeout` seconds, letting one trial call through; the trial's
+    outcome closes or re-opens the circuit.
+
+    before_call() returns a trial token when the caller is the half-open trial
+    (else None). Callers must pass it to abort_trial() when the attempt ends
+    without recording an outcome (cancelled, disconnected, unexpected error),
+    or every later call would be rejected.
+    """
+
+    def __init__(self, failures: int, reset_timeout: float):
+        self.max_failures = failures
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = None
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial is not None):
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            raise CircuitOpenError(max(remaining, 1.0))
+        if state == "half_open":
+            self._trial = object()
+            return self._trial
+        return None
+
+    def abort_trial(self, trial):
+        """Free the half-open slot if `trial` still holds it; no-op otherwise."""
+        if trial is not None and self._trial is trial:
+            self._trial = None
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial is not None or self.failures >= self.max_failures:
+            if self.opened_at is None or self._trial is not None:
+                logger.warning(f"LLM circuit opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+        self._trial = None
+
+
+# -------------------------------
+# Gateway
+# -------------------------------
+def _backoff(attempt: int, retry_after: float = None) -> float:
+    if retry_after is not None:
+        return min(retry_after, GROQ_BACKOFF_MAX) + random.uniform(0, GROQ_BACKOFF_BASE)
+    # "full jitter": uniform in [0, base * 2^attempt]
+    return random.uniform(0, min(GROQ_BACKOFF_MAX, GROQ_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _retry_after(response) -> float:
+    """Retry-After seconds from an httpx response or an UpstreamError carrying its headers."""
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGateway:
+    """
+    Single entry point for Groq chat completions: rate limiting by priority,
+    retries with jittered exponential backoff, and a circuit breaker.
+    """
+
+    def __init__(self, rpm=GROQ_RPM, tpm=GROQ_TPM, reserve=GROQ_INTERACTIVE_RESERVE,
+                 max_retries=GROQ_MAX_RETRIES):
+        self.limiter = RateLimiter(rpm, tpm, reserve)
+        self.breaker = CircuitBreaker(GROQ_BREAKER_FAILURES, GROQ_BREAKER_RESET)
+        self.max_retries = max_retries
+
+    @staticmethod
+    def _api_key():
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY is not set in environment variables.")
+        return api_key
+
+    @staticmethod
+    def _estimate(messages, expected_output_tokens):
+        return sum(estimate_tokens(m.get("content", "")) for m in messages) + expected_output_tokens
+
+    async def chat_completion(self, messages: list, model: str = GROQ_MODEL, priority: int = DEFAULT,
+                              timeout: float = 60, expected_output_tokens: int = 1000, **extra) -> dict:
+        """Return the completion JSON. Raises CircuitOpenError, UpstreamError or httpx errors."""
+        api_key = self._api_key()
+        estimate = self._estimate(messages, expected_output_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            trial = self.breaker.before_call()
+            try:
+                await self.limiter.acquire(estimate, priority)
+                try:
+                    with upstream_timer("groq") as outcome:
+                        response = await groq_chat(api_key, messages, model=model, timeout=timeout, **extra)
+                        outcome["status"] = response.status_code
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    self.breaker.record_failure()
+                    if attempt == self.max_retries:
+                        raise
+                    delay = _backoff(attempt)
+                    logger.warning(f"Groq call failed ({e!r}), retry {attempt + 1} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    data = response.json()
+                    used = (data.get("usage") or {}).get("total_tokens")
+                    if used:
+                        self.limiter.adjust_tokens(used - estimate)
+                    return data
+
+                if response.status_code == 429:
+                    # rate limited, not down: back off without tripping the breaker
+                    self.breaker.record_success()
+                    retry_after = _retry_after(response)
+                    self.limiter.drain(retry_after or 1.0)
+                elif response.status_code in RETRYABLE_STATUS:
+                    self.breaker.record_failure()
+                    retry_after = _retry_after(response)
+                else:
+                    self.breaker.record_success()
+                    raise UpstreamError(response.status_code, response.text)
+
+                if attempt == self.max_retries:
+                    raise UpstreamError(response.status_code, response.text)
+                delay = _backoff(attempt, retry_after)
+                logger.warning(f"Groq returned {response.status_code}, retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            finally:
+                # recorded outcomes already freed the slot; this covers cancellation etc.
+                self.breaker.abort_trial(trial)
+
+    async def chat(self, messages: list, **kwargs) -> str:
+        """Completion text only; raises UpstreamError if the reply has no choices."""
+        data = await self.chat_completion(messages, **kwargs)
+        choices = data.get("choices") or []
+        if not choices:
+            raise UpstreamError(200, f"Malformed response from AI service: {str(data)[:200]}")
+        # content is null for e.g. tool-call or filtered replies
+        return (choices[0].get("message", {}).get("content") or "").strip()
+
+    async def stream(self, messages: list, model: str = GROQ_MODEL, priority: int = DEFAULT,
+                     timeout: float = 60, expected_output_tokens: int = 1000, **extra):
+        """
+        Async generator of content deltas. Failures before the first token are
+        retried like chat_completion; once tokens have been sent they aren't.
+        """
+        api_key = self._api_key()
+        estimate = self._estimate(messages, expected_output_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            trial = self.breaker.before_call()
+            try:
+                await self.limiter.acquire(estimate, priority)
+                started = False
+                try:
+                    # timed until the last token, so this is the full generation time
+                    with upstream_timer("groq_stream"):
+                        async for token in groq_chat_stream(api_key, messages, model=model, timeout=timeout, **extra):
+                            started = True
+                            yield token
+                    self.breaker.record_success()
+                    return
+                except (httpx.TimeoutException, httpx.TransportError, UpstreamError) as e:
+                    status = getattr(e, "status_code", None)
+                    retry_after = _retry_after(e) if status is not None else None
+                    if status == 429:
+                        self.breaker.record_success()
+                        self.limiter.drain(retry_after or 1.0)
+                    elif status is None or status in RETRYABLE_STATUS:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                        raise
+                    if started or attempt == self.max_retries:
+                        raise
+                    delay = _backoff(attempt, retry_after)
+                    logger.warning(f"Groq stream failed ({e!r}), retry {attempt + 1} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+            finally:
+                # also runs on GeneratorExit (client went away) and bad chunks
+                self.breaker.abort_trial(trial)
+
+
+# shared by chatbot.py, groq_llm.py and llm.py
+gateway = LLMGateway()
@@ -0,0 +1,306 @@
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from uuid import uuid4
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger("timing")
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+# one JSON log line per request and per pipeline stage, tagged with the request id
+TIMING_LOGS = os.getenv("TIMING_LOGS", "false").lower() in ("1", "true", "yes")
+
+# seconds; spans a cache hit (ms) up to a slow LLM completion (a minute)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+
+# -------------------------------
+# Metric types (Prometheus text exposition format 0.0.4)
+# -------------------------------
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self):
+        """Yield (suffix, label_values, extra_labels, value)."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", key, (), value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket (non-cumulative) counts, sum, count
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                yield "_bucket", key, (("le", _format_value(float(bound))),), cumulative
+            yield "_bucket", key, (("le", "+Inf"),), count
+            yield "_sum", key, (), total
+            yield "_count", key, (), count
+
+
+class GaugeCallback(_Metric):
+    """A gauge whose samples are read at scrape time: `fn()` returns {label_values_tuple: value}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames, fn):
+        super().__init__(name, documentation, labelnames)
+        self._fn = fn
+
+    def samples(self):
+        try:
+            values = self._fn()
+        except Exception as e:
+            logger.warning(f"metrics collector {self.name} failed: {e}")
+            return
+        for key, value in values.items():
+            yield "", key if isinstance(key, tuple) else (key,), (), value
+
+
+class CounterCallback(GaugeCallback):
+    """A counter kept elsewhere (e.g. a cache's running totals), read at scrape time like GaugeCallback."""
+    kind = "counter"
+
+
+REGISTRY = []
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------
+# Application metrics
+# -------------------------------
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_DURATION = Histogram("http_request_duration_seconds", "Time to the last response byte, by route.", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+
+STAGE_DURATION = Histogram("pipeline_stage_duration_seconds", "Resume pipeline stage latency.", ("stage",))
+STAGE_IN_FLIGHT = Gauge("pipeline_stage_in_flight", "Pipeline stages currently running.", ("stage",))
+
+UPSTREAM_DURATION = Histogram("upstream_request_duration_seconds", "Calls to external APIs, by upstream and outcome.",
+                              ("upstream", "outcome"))
+UPSTREAM_IN_FLIGHT = Gauge("upstream_requests_in_flight", "Calls to external APIs currently open.", ("upstream",))
+
+ERRORS = Counter("errors_total", "Errors by where they were caught and exception type.", ("where", "type"))
+
+
+def count_error(where: str, exc: BaseException):
+    ERRORS.inc(where=where, type=type(exc).__name__)
+
+
+def log_timing(event: str, **fields):
+    if TIMING_LOGS:
+        logger.info(json.dumps({"event": event, "request_id": request_id_var.get(), **fields}))
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time one pipeline stage into STAGE_DURATION (and the timing log)."""
+    start = time.perf_counter()
+    STAGE_IN_FLIGHT.inc(stage=stage)
+    outcome = "ok"
+    try:
+        yield
+    except BaseException as e:
+        outcome = type(e).__name__
+        count_error(f"stage:{stage}", e)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_IN_FLIGHT.dec(stage=stage)
+        STAGE_DURATION.observe(elapsed, stage=stage)
+        log_timing("stage", stage=stage, ms=round(elapsed * 1000, 2), outcome=outcome)
+
+
+@contextmanager
+def upstream_timer(upstream: str):
+    """
+    Time one external call into UPSTREAM_DURATION. The block may set
+    `outcome["status"]` (e.g. the HTTP status); exceptions are recorded by type.
+    """
+    start = time.perf_counter()
+    outcome = {"status": "ok"}
+    UPSTREAM_IN_FLIGHT.inc(upstream=upstream)
+    try:
+        yield outcome
+    except BaseException as e:
+        outcome["status"] = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        UPSTREAM_IN_FLIGHT.dec(upstream=upstream)
+        UPSTREAM_DURATION.observe(elapsed, upstream=upstream, outcome=str(outcome["status"]))
+        log_timing("upstream", upstream=upstream, ms=round(elapsed * 1000, 2), outcome=str(outcome["status"]))
+
+
+def cache_metrics(caches: dict):
+    """Register hit/miss counters and a hit-ratio gauge for {name: object with .stats()} (TTLCache, ExtractionCache)."""
+    def read(field):
+        return lambda: {(name, ): cache.stats()[field] for name, cache in caches.items()}
+    CounterCallback("cache_hits_total", "Cache hits since start.", ("cache",), read("hits"))
+    CounterCallback("cache_misses_total", "Cache misses since start.", ("cache",), read("misses"))
+    GaugeCallback("cache_hit_ratio", "hits / (hits + misses) since start.", ("cache",), read("hit_ratio"))
+
+
+# -------------------------------
+# ASGI middleware
+# -------------------------------
+class MetricsMiddleware:
+    """
+    Per-request counters and latency (until the last body chunk, so streamed
+    responses are timed in full), an X-Request-ID header (the client's if
+    sent) and, with TIMING_LOGS, one JSON log line per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid4().hex
+        token = request_id_var.set(request_id)
+        status = {"code": 500}
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            count_error("http", e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            # the route template keeps label cardinality bounded (/jobs/{job_id}, not every id)
+            route = getattr(scope.get("route"), "path", None) or "static"
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(method=method, route=route, status=status["code"])
+            HTTP_DURATION.observe(elapsed, method=method, route=route)
+            log_timing("request", method=method, route=route, status=status["code"], ms=round(elapsed * 1000, 2))
+            request_id_var.reset(token)
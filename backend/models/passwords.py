@@ -0,0 +1,37 @@
+import os
+from passlib.context import CryptContext
+from dotenv import load_dotenv
+from pathlib import Path
+
+from backend.models.workers import run_password
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+# bcrypt cost factor: each +1 doubles hashing time (12 is ~250 ms on one core)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# min = max = default, so hashes at any other cost are upgraded (or downgraded) on next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+
+async def hash_password(password: str) -> str:
+    """bcrypt-hash off the event loop. Raises PoolSaturated when too many hashes are queued."""
+    return await run_password(pwd_context.hash, password)
+
+
+async def verify_password(password: str, hashed: str):
+    """
+    Check `password` against `hashed` off the event loop.
+    Returns (valid, new_hash): new_hash is set when the stored hash uses
+    another cost or scheme and should replace it.
+    """
+    return await run_password(pwd_context.verify_and_update, password, hashed)
@@ -1,8 +1,8 @@
 import os
 import fitz  # PyMuPDF
-import markdown
 from llm import generate_optimized_resume
-from weasyprint import HTML
+from backend.models.extraction_cache import extraction_cache
+from backend.models.renderer import get_renderer, get_renderer_for_css_file
 
 # Set environment path for dependencies
 os.environ["PATH"] += os.pathsep + r"C:\msys64\mingw64\bin"
@@ -21,21 +21,30 @@ def pdf_to_markdown(pdf_path):
     if not os.path.exists(pdf_path):
         print(f"Error: The file {pdf_path} does not exist.")
         return ""
-    
+
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+
+    # repeat uploads of the same resume skip PyMuPDF entirely
+    return extraction_cache.get_or_extract(data, "markdown", pdf_bytes_to_markdown)
+
+def pdf_bytes_to_markdown(data):
+    """Parse in-memory PDF bytes into the page-by-page Markdown used by the optimizer."""
     md_content = []
     try:
-        doc = fitz.open(pdf_path)
+        doc = fitz.open(stream=data, filetype="pdf")
     except Exception as e:
         print(f"Error opening PDF: {e}")
         return ""
-    
-    for page_num, page in enumerate(doc, start=1):
-        text = page.get_text("text").strip()
-        if text:
-            md_content.append(f"# Page {page_num}\n")
-            md_content.append("```")
-            md_content.append(text)
-            md_content.append("```\n")
+
+    with doc:
+        for page_num, page in enumerate(doc, start=1):
+            text = page.get_text("text").strip()
+            if text:
+                md_content.append(f"# Page {page_num}\n")
+                md_content.append("```")
+                md_content.append(text)
+                md_content.append("```\n")
 
     return "\n".join(md_content)
 
@@ -46,14 +55,30 @@ def save_markdown_to_file(markdown_content, filename):
         f.write(markdown_content)
     return file_path
 
-def markdown_to_pdf(input_md, output_pdf, css_path=None):
+def markdown_string_to_pdf(md_content, theme="default"):
+    """
+    Render a Markdown string to PDF bytes in memory.
+
+    Use this for any text that isn't a trusted path (LLM output, user input):
+    unlike markdown_to_pdf it never treats its argument as a file to read.
+    """
+    return get_renderer(theme).render(md_content)
+
+def markdown_to_pdf(input_md, output_pdf=None, css_path=None, theme="default"):
     """
-    Convert a Markdown file or string to a well-formatted PDF.
+    Convert a Markdown file or string to a well-formatted PDF (CLI/script use;
+    request handlers go through markdown_string_to_pdf).
     
     Args:
         input_md (str): Path to the Markdown file or Markdown string.
-        output_pdf (str): Path where the output PDF will be saved.
+        output_pdf (str, optional): Path where the output PDF will be saved.
+            If omitted, the PDF is rendered in memory and returned as bytes.
         css_path (str, optional): Path to a custom CSS file for styling.
+        theme (str, optional): Name of a registered theme (see renderer.py),
+            used when css_path isn't given.
+
+    Returns:
+        bytes | None: The PDF bytes when output_pdf is None.
     """
 
     if os.path.isfile(input_md):
@@ -62,57 +87,20 @@ def markdown_to_pdf(input_md, output_pdf, css_path=None):
     else:
         md_content = input_md
 
-    md = markdown.Markdown(extensions=['extra', 'codehilite', 'toc'])
-    html_content = md.convert(md_content)
-
-    default_css = """
-    @page {
-        size: A4;
-        margin: 1.5cm;
-        @bottom-right {
-            content: "Page " counter(page) " of " counter(pages);
-            font-size: 9pt;
-            color: #666;
-        }
-    }
-    body {
-        font-family: "Helvetica", "Arial", sans-serif;
-        font-size: 10pt;
-        line-height: 1.5;
-        color: #333;
-    }
-    h1 {
-        font-size: 22pt;
-        font-weight: bold;
-        color: #1a2a44;
-        border-bottom: 2px solid #1a2a44;
-    }
-    """
-
+    # renderers keep their compiled CSS and font config between calls
     if css_path and os.path.isfile(css_path):
-        with open(css_path, 'r', encoding='utf-8') as f:
-            css = f.read()
+        renderer = get_renderer_for_css_file(css_path)
     else:
-        css = default_css
-
-    html_with_style = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>{css}</style>
-    </head>
-    <body>
-        {html_content}
-    </body>
-    </html>
-    """
+        renderer = get_renderer(theme)
 
     try:
-        HTML(string=html_with_style).write_pdf(output_pdf)
+        if output_pdf is None:
+            return renderer.render(md_content)
+        renderer.render(md_content, output_pdf)
         print(f"Converted Markdown to PDF: {output_pdf}")
     except Exception as e:
         print(f"Error converting Markdown to PDF: {e}")
+        raise
 
 if __name__ == "__main__":
     input_pdf_path = os.path.join(UPLOADS_DIR, "resume.pdf")
@@ -0,0 +1,35 @@
+from backend.models.extraction_cache import extraction_cache, content_key
+from backend.models.pdf_converter import pdf_bytes_to_markdown, markdown_string_to_pdf
+from backend.models.llm import agenerate_optimized_resume
+from backend.models.llm_gateway import DEFAULT
+from backend.models.workers import run_cpu
+from backend.models.metrics import stage_timer
+
+# -------------------------------
+# Async stages of the resume pipeline
+# PDF parsing and rendering run in the process pool; the LLM call goes
+# through the rate-limited gateway on the event loop.
+# -------------------------------
+
+async def extract_markdown_bytes(data: bytes, digest: str = None) -> str:
+    """pdf_bytes_to_markdown, with the cache checked here and only misses sent to a worker process."""
+    with stage_timer("extract"):
+        key = content_key(data, "markdown", digest)
+        md = await extraction_cache.aget(key)
+        if md is None:
+            md = await run_cpu(pdf_bytes_to_markdown, data)
+            if md:
+                await extraction_cache.aput(key, md)
+        return md
+
+
+async def optimize_markdown(md_resume: str, job_description: str, priority: int = DEFAULT) -> str:
+    with stage_timer("optimize"):
+        return await agenerate_optimized_resume(md_resume, job_description, priority=priority)
+
+
+async def render_pdf(md_text: str) -> bytes:
+    """Render Markdown to PDF bytes in memory; nothing touches the disk."""
+    with stage_timer("render"):
+        # string-only entry point: LLM output that looks like a path is still just text
+        return await run_cpu(markdown_string_to_pdf, md_text)
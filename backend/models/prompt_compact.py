@@ -0,0 +1,186 @@
+import re
+import math
+from collections import Counter
+
+# -------------------------------
+# Resume text -> compact prompt input
+# -------------------------------
+PAGE_HEADER_RE = re.compile(r"^#\s*Page\s+\d+\s*$", re.IGNORECASE)
+FENCE_RE = re.compile(r"^\s*```\s*$")
+# "3", "- 3 -", "Page 3", "3 / 4", "Page 3 of 4"; short on purpose so years
+# ("2021") and phone numbers are never mistaken for one
+PAGE_NUMBER_RE = re.compile(r"^\s*[-–]?\s*(?:page\s*)?\d{1,3}\s*(?:(?:/|of)\s*\d{1,3})?\s*[-–]?\s*$", re.IGNORECASE)
+BULLET_ONLY_RE = re.compile(r"^[•●▪◦‣∙·\-–*]$")
+
+# section heading -> priority (lower = kept longer when over budget)
+SECTION_PRIORITY = {
+    "summary": 1, "professional summary": 1, "profile": 1, "objective": 1, "career objective": 1,
+    "about me": 1,
+    "skills": 1, "technical skills": 1, "core skills": 1, "key skills": 1, "core competencies": 1,
+    "experience": 1, "work experience": 1, "professional experience": 1, "employment history": 1,
+    "internships": 2, "internship": 2,
+    "projects": 2, "academic projects": 2, "personal projects": 2,
+    "education": 2, "academic background": 2,
+    "certifications": 3, "certificates": 3, "achievements": 3, "awards": 3, "publications": 3,
+    "languages": 4, "activities": 4, "extracurricular activities": 4, "volunteering": 4,
+    "interests": 5, "hobbies": 5, "personal details": 5, "declaration": 5, "references": 5,
+}
+DEFAULT_PRIORITY = 3
+# the untitled block at the top (name, contact details) is always kept
+PREAMBLE_PRIORITY = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English prose: ~4 characters per token."""
+    return math.ceil(len(text or "") / 4)
+
+
+def _split_pages(text: str) -> list:
+    pages, current = [], []
+    for line in text.splitlines():
+        if PAGE_HEADER_RE.match(line) or "\f" in line:
+            if current:
+                pages.append(current)
+            current = []
+            line = line.replace("\f", "")
+            if PAGE_HEADER_RE.match(line):
+                continue
+        if FENCE_RE.match(line):
+            continue
+        current.append(line)
+    if current:
+        pages.append(current)
+    return pages
+
+
+def _strip_page_numbers(page: list) -> list:
+    """Drop a page-number line, only as the first or last non-empty line of the page."""
+    content = [i for i, l in enumerate(page) if l.strip()]
+    drop = {i for i in content[:1] + content[-1:] if PAGE_NUMBER_RE.match(page[i])}
+    return [l for i, l in enumerate(page) if i not in drop]
+
+
+def _strip_repeated_edges(pages: list, edge: int = 2) -> list:
+    """Drop header/footer lines that repeat at the top or bottom of most pages, and bare page numbers."""
+    pages = [_strip_page_numbers(page) for page in pages]
+    if len(pages) < 2:
+        return pages
+
+    def edges(page):
+        content = [l.strip() for l in page if l.strip()]
+        return set(content[:edge] + content[-edge:])
+
+    counts = Counter(line for page in pages for line in edges(page))
+    repeated = {line for line, n in counts.items() if n >= max(2, len(pages) // 2 + 1)}
+
+    cleaned = []
+    for i, page in enumerate(pages):
+        # keep the first page's copy: that's usually the real name/contact line
+        drop = repeated if i > 0 else set()
+        cleaned.append([l for l in page if l.strip() not in drop])
+    return cleaned
+
+
+def _collapse_whitespace(lines: list) -> list:
+    out = []
+    pending_bullet = None
+    for line in lines:
+        line = re.sub(r"[ \t\u00a0]+", " ", line).strip()
+        # PyMuPDF often puts a bullet glyph on its own line: glue it to the text
+        if BULLET_ONLY_RE.match(line):
+            pending_bullet = "-"
+            continue
+        if pending_bullet and line:
+            line, pending_bullet = f"{pending_bullet} {line}", None
+        if line or (out and out[-1]):
+            out.append(line)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+def _heading_priority(line: str, known_only: bool = False):
+    key = " ".join(re.sub(r"[^a-z ]", " ", line.lower()).split())
+    if key in SECTION_PRIORITY:
+        return SECTION_PRIORITY[key]
+    # short ALL-CAPS lines are headings in most PDF resumes
+    if not known_only and line.isupper() and 1 <= len(key.split()) <= 4:
+        return DEFAULT_PRIORITY
+    return None
+
+
+def _sections(lines: list) -> list:
+    """Split into [priority, lines] blocks at headings, in document order."""
+    sections = [[PREAMBLE_PRIORITY, []]]
+    for line in lines:
+        # until a known heading is seen, ALL-CAPS lines ("JANE DOE") are part of the preamble
+        priority = _heading_priority(line, known_only=len(sections) == 1) if line else None
+        if priority is not None:
+            sections.append([priority, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [s for s in sections if s[1]]
+
+
+def _fit_to_budget(sections: list, budget: int):
+    """Drop, then trim, the lowest-priority (latest first) sections until under `budget` tokens."""
+    texts = ["\n".join(lines).strip() for _, lines in sections]
+    total = estimate_tokens("\n\n".join(texts))
+    if total <= budget:
+        return texts, False
+
+    order = sorted(range(len(sections)), key=lambda i: (sections[i][0], i), reverse=True)
+    for i in order:
+        if total <= budget or sections[i][0] == PREAMBLE_PRIORITY:
+            break
+        excess = total - budget
+        section_tokens = estimate_tokens(texts[i])
+        if section_tokens <= excess:
+            texts[i] = ""
+            total -= section_tokens
+        else:
+            # keep the start of the section, cut at a line boundary
+            keep_chars = (section_tokens - excess) * 4
+            cut = texts[i][:keep_chars]
+            cut = cut[:cut.rfind("\n")].strip() if "\n" in cut else ""
+            # a heading with nothing left under it is just noise in the prompt
+            texts[i] = cut if "\n" in cut else ""
+            total = estimate_tokens("\n\n".join(t for t in texts if t))
+    return [t for t in texts if t], True
+
+
+class CompactResult:
+    def __init__(self, text: str, original_tokens: int, truncated: bool):
+        self.text = text
+        self.tokens = estimate_tokens(text)
+        self.original_tokens = original_tokens
+        self.truncated = truncated
+
+    def __repr__(self):
+        return f"<CompactResult {self.original_tokens} -> {self.tokens} tokens{' (truncated)' if self.truncated else ''}>"
+
+
+def compact_resume(text: str, token_budget: int = None) -> CompactResult:
+    """
+    Shrink extracted resume text for a prompt: drop the '# Page N' headers and
+    code fences added by pdf_to_markdown, repeated page headers/footers and
+    page numbers, and redundant whitespace. If `token_budget` is set and still
+    exceeded, whole low-priority sections (hobbies, references, ...) are
+    dropped first, then the next one is cut short.
+    """
+    original_tokens = estimate_tokens(text)
+    pages = _strip_repeated_edges(_split_pages(text or ""))
+    lines = _collapse_whitespace([line for page in pages for line in page + [""]])
+
+    truncated = False
+    if token_budget and estimate_tokens("\n".join(lines)) > token_budget:
+        texts, truncated = _fit_to_budget(_sections(lines), token_budget)
+        compacted = "\n\n".join(texts)
+    else:
+        compacted = "\n".join(lines)
+    return CompactResult(compacted, original_tokens, truncated)
+
+
+def compact_text(text: str) -> str:
+    """Whitespace-only compaction, for free text such as job descriptions."""
+    return "\n".join(_collapse_whitespace((text or "").splitlines()))
@@ -0,0 +1,73 @@
+import numpy as np
+
+from backend.models.keywords import tokenize
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# a resume term found in the job title counts this many times over one in the description
+TITLE_WEIGHT = 3.0
+
+
+class ResumeRanker:
+    """
+    BM25 ranking of job listings against a full resume.
+
+    The resume's distinct terms form a fixed vocabulary with per-term query
+    weights, built once. Each batch of listings becomes a (jobs x vocabulary)
+    term-frequency matrix and is scored in a few NumPy operations.
+    """
+
+    def __init__(self, resume_text: str):
+        tokens = tokenize(resume_text)
+        self.vocabulary = {}
+        for token in tokens:
+            self.vocabulary.setdefault(token, len(self.vocabulary))
+        counts = np.bincount(
+            np.fromiter((self.vocabulary[t] for t in tokens), dtype=np.int64, count=len(tokens)),
+            minlength=len(self.vocabulary),
+        ).astype(np.float64)
+        # sublinear weighting, so a word repeated 20 times doesn't dominate
+        self.query_weights = np.where(counts > 0, 1.0 + np.log(np.maximum(counts, 1.0)), 0.0)
+
+    def _term_matrix(self, texts):
+        """(len(texts) x vocabulary) term frequencies plus each text's token count."""
+        rows, cols, lengths = [], [], np.zeros(len(texts), dtype=np.float64)
+        vocab = self.vocabulary
+        for i, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[i] = len(tokens)
+            ids = [vocab[t] for t in tokens if t in vocab]
+            rows.extend([i] * len(ids))
+            cols.extend(ids)
+        # one bincount over flattened (row, col) cells instead of a Python loop of adds
+        flat = np.asarray(rows, dtype=np.int64) * len(vocab) + np.asarray(cols, dtype=np.int64)
+        tf = np.bincount(flat, minlength=len(texts) * len(vocab)).astype(np.float64)
+        return tf.reshape(len(texts), len(vocab)), lengths
+
+    def scores(self, jobs) -> np.ndarray:
+        if not jobs or not self.vocabulary:
+            return np.zeros(len(jobs), dtype=np.float64)
+
+        title_tf, title_len = self._term_matrix([job.get("title") or "" for job in jobs])
+        desc_tf, desc_len = self._term_matrix([job.get("description") or "" for job in jobs])
+        tf = desc_tf + TITLE_WEIGHT * title_tf
+        doc_len = desc_len + TITLE_WEIGHT * title_len
+
+        n_docs = len(jobs)
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        avg_len = doc_len.mean() or 1.0
+        norm = K1 * (1.0 - B + B * doc_len / avg_len)
+        saturated = tf * (K1 + 1.0) / (tf + norm[:, None])
+        return saturated @ (idf * self.query_weights)
+
+    def rank(self, jobs) -> list:
+        """Copies of `jobs` with a `score` field, best match first (ties keep API order)."""
+        scores = self.scores(jobs)
+        order = np.argsort(-scores, kind="stable")
+        return [{**jobs[i], "score": round(float(scores[i]), 4)} for i in order]
+
+
+def rank_jobs(resume_text: str, jobs: list) -> list:
+    return ResumeRanker(resume_text).rank(jobs)
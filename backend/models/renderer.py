@@ -0,0 +1,179 @@
+import os
+import threading
+import markdown
+from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
+
+MARKDOWN_EXTENSIONS = ['extra', 'codehilite', 'toc']
+
+HTML_TEMPLATE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+    </head>
+    <body>
+        {html_content}
+    </body>
+    </html>
+    """
+
+# -------------------------------
+# Built-in themes
+# -------------------------------
+DEFAULT_CSS = """
+    @page {
+        size: A4;
+        margin: 1.5cm;
+        @bottom-right {
+            content: "Page " counter(page) " of " counter(pages);
+            font-size: 9pt;
+            color: #666;
+        }
+    }
+    body {
+        font-family: "Helvetica", "Arial", sans-serif;
+        font-size: 10pt;
+        line-height: 1.5;
+        color: #333;
+    }
+    h1 {
+        font-size: 22pt;
+        font-weight: bold;
+        color: #1a2a44;
+        border-bottom: 2px solid #1a2a44;
+    }
+    """
+
+CLASSIC_CSS = """
+    @page {
+        size: A4;
+        margin: 2cm;
+    }
+    body {
+        font-family: Arial, sans-serif;
+        font-size: 12pt;
+        line-height: 1.6;
+        color: #333;
+    }
+    h1, h2, h3, h4, h5, h6 {
+        color: #2c3e50;
+        margin-top: 1.5em;
+        margin-bottom: 0.5em;
+    }
+    h1 {
+        font-size: 24pt;
+        border-bottom: 2px solid #2c3e50;
+    }
+    h2 {
+        font-size: 20pt;
+        border-bottom: 1px solid #ddd;
+    }
+    p {
+        margin: 0.5em 0;
+    }
+    table {
+        width: 100%;
+        border-collapse: collapse;
+        margin: 1em 0;
+    }
+    th, td {
+        border: 1px solid #ddd;
+        padding: 8px;
+        text-align: left;
+    }
+    code, pre, .codehilite {
+        background-color: #f4f4f4;
+    }
+    """
+
+
+class PdfRenderer:
+    """
+    Markdown -> PDF renderer with its stylesheet compiled once.
+
+    The weasyprint.CSS object and FontConfiguration are built in __init__
+    and shared by every render; each thread reuses its own markdown.Markdown
+    instance (reset between documents), since those aren't thread-safe.
+    """
+
+    def __init__(self, css: str, extensions=MARKDOWN_EXTENSIONS):
+        self.extensions = list(extensions)
+        self.font_config = FontConfiguration()
+        self.stylesheet = CSS(string=css, font_config=self.font_config)
+        self._local = threading.local()
+
+    def _converter(self):
+        md = getattr(self._local, "md", None)
+        if md is None:
+            md = self._local.md = markdown.Markdown(extensions=self.extensions)
+        else:
+            md.reset()
+        return md
+
+    def to_html(self, md_content: str) -> str:
+        return HTML_TEMPLATE.format(html_content=self._converter().convert(md_content))
+
+    def render(self, md_content: str, output_pdf=None):
+        """Render to `output_pdf` (path or file object), or return the PDF bytes if omitted."""
+        return HTML(string=self.to_html(md_content)).write_pdf(
+            output_pdf,
+            stylesheets=[self.stylesheet],
+            font_config=self.font_config,
+        )
+
+
+# -------------------------------
+# Theme registry
+# -------------------------------
+_themes = {
+    "default": DEFAULT_CSS,
+    "classic": CLASSIC_CSS,
+}
+_renderers = {}
+_lock = threading.Lock()
+
+
+def register_theme(name: str, css: str):
+    """Add or replace a named theme; its renderer is (re)built on next use."""
+    with _lock:
+        _themes[name] = css
+        _renderers.pop(name, None)
+
+
+def available_themes():
+    return sorted(_themes)
+
+
+def get_renderer(theme: str = "default") -> PdfRenderer:
+    with _lock:
+        renderer = _renderers.get(theme)
+        if renderer is None:
+            if theme not in _themes:
+                raise KeyError(f"Unknown theme '{theme}'. Available: {', '.join(sorted(_themes))}")
+            renderer = _renderers[theme] = PdfRenderer(_themes[theme])
+        return renderer
+
+
+def get_renderer_for_css_file(css_path: str) -> PdfRenderer:
+    """Renderer for a custom CSS file, rebuilt only when the file changes."""
+    prefix = f"file:{os.path.abspath(css_path)}:"
+    name = f"{prefix}{os.path.getmtime(css_path)}"
+    with _lock:
+        known = name in _themes
+    if not known:
+        with open(css_path, 'r', encoding='utf-8') as f:
+            css = f.read()
+        with _lock:
+            # forget renderers built from older versions of this file
+            for stale in [n for n in _themes if n.startswith(prefix)]:
+                _themes.pop(stale)
+                _renderers.pop(stale, None)
+        register_theme(name, css)
+    return get_renderer(name)
+
+
+def preload_themes():
+    """Build every registered renderer up front (e.g. in each worker process)."""
+    for name in available_themes():
+        get_renderer(name)
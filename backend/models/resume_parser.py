@@ -1,8 +1,29 @@
 import fitz  # PyMuPDF
+from backend.models.extraction_cache import extraction_cache, content_key
+from backend.models.workers import run_cpu
 
 def extract_text_from_pdf(pdf_path):
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    return extract_text_from_data(data)
+
+def extract_text_from_data(data, digest=None):
+    # cached by content hash, so re-uploads of the same resume aren't re-parsed
+    return extraction_cache.get_or_extract(data, "text", extract_text_from_bytes, digest)
+
+async def aextract_text_from_data(data, digest=None):
+    # same cache, without blocking the event loop; only misses are parsed, in a worker process
+    key = content_key(data, "text", digest)
+    text = await extraction_cache.aget(key)
+    if text is None:
+        text = await run_cpu(extract_text_from_bytes, data)
+        if text:
+            await extraction_cache.aput(key, text)
+    return text
+
+def extract_text_from_bytes(data):
     text = ""
-    doc = fitz.open(pdf_path)
-    for page in doc:
-        text += page.get_text()
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for page in doc:
+            text += page.get_text()
     return text
@@ -0,0 +1,39 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# headers that stop proxies (nginx in particular) from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(data, event: str = None) -> str:
+    """Format one Server-Sent Event; `data` is JSON-encoded so newlines survive."""
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def relay_tokens(request, tokens):
+    """
+    Relay an async iterator of text tokens as `token` events, finishing with
+    `done` (or `error`). Stops pulling from `tokens` as soon as the client goes
+    away, and always closes it so the upstream stream is released.
+    """
+    try:
+        async for token in tokens:
+            if await request.is_disconnected():
+                logger.info("SSE client disconnected, cancelling upstream stream")
+                return
+            yield sse_event({"token": token}, event="token")
+        yield sse_event({}, event="done")
+    except Exception as e:
+        logger.error(f"Streaming failed: {e}")
+        yield sse_event({"error": str(e)}, event="error")
+    finally:
+        await tokens.aclose()
@@ -0,0 +1,266 @@
+import os
+import re
+import gzip
+import hashlib
+import logging
+import mimetypes
+import threading
+from dotenv import load_dotenv
+from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, PlainTextResponse, RedirectResponse, Response
+
+from backend.models.http_cache import IMMUTABLE, http_date, not_modified
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+STATIC_DIR = os.getenv("STATIC_DIR", "frontend")
+# files matching this (relative path) have a content hash in their name and never change;
+# the default fits Vite's build output (assets/index-4f3a2b1c.js)
+STATIC_IMMUTABLE_PATTERN = os.getenv("STATIC_IMMUTABLE_PATTERN", r"^assets/.+[.-][0-9A-Za-z_-]{8,}\.\w+$")
+# everything else may change between deploys: cache, but revalidate (a cheap 304)
+STATIC_CACHE_CONTROL = os.getenv("STATIC_CACHE_CONTROL", "no-cache")
+STATIC_BROTLI_QUALITY = int(os.getenv("STATIC_BROTLI_QUALITY", "11"))
+STATIC_GZIP_LEVEL = int(os.getenv("STATIC_GZIP_LEVEL", "9"))
+# smaller files gain nothing from compression; bigger ones are streamed from disk uncompressed
+STATIC_MIN_COMPRESS_BYTES = int(os.getenv("STATIC_MIN_COMPRESS_BYTES", "1024"))
+STATIC_MAX_COMPRESS_MB = float(os.getenv("STATIC_MAX_COMPRESS_MB", "10"))
+
+COMPRESSIBLE_TYPES = {
+    "application/javascript", "application/json", "application/manifest+json",
+    "application/xml", "application/wasm", "image/svg+xml", "image/x-icon",
+}
+# server preference when the client accepts several equally
+ENCODING_PREFERENCE = ("br", "gzip")
+SIDECAR_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+
+def _compressible(media_type: str) -> bool:
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def accepted_encodings(header: str) -> dict:
+    """Parse Accept-Encoding into {coding: q}."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header: str, available) -> str:
+    """The best of `available` the client accepts, or None for identity."""
+    accepted = accepted_encodings(header or "")
+    best, best_q = None, 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding not in available:
+            continue
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class StaticAsset:
+    """One file: its validators, cache policy and precompressed bodies."""
+
+    __slots__ = ("path", "size", "mtime", "media_type", "etag", "cache_control", "encoded")
+
+    def __init__(self, path, size, mtime, media_type, etag, cache_control, encoded):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.media_type = media_type
+        self.etag = etag
+        self.cache_control = cache_control
+        # coding -> compressed bytes, only when smaller than the original
+        self.encoded = encoded
+
+
+class PrecompressedStaticFiles:
+    """
+    Drop-in for StaticFiles(html=True) that serves Brotli/gzip bodies
+    compressed once (at startup, or on first request for new files),
+    negotiated via Accept-Encoding.
+
+    Every response carries a strong ETag (content hash, per encoding) and
+    Last-Modified, and conditional requests get 304. Hashed build assets are
+    cached as immutable; other files revalidate. `.br`/`.gz` files written
+    next to an asset at build time are used instead of compressing it here.
+    """
+
+    def __init__(self, directory: str = STATIC_DIR, immutable_pattern: str = STATIC_IMMUTABLE_PATTERN):
+        self.directory = os.path.realpath(directory)
+        if not os.path.isdir(self.directory):
+            logger.warning(f"Static directory {self.directory} does not exist")
+        self.immutable = re.compile(immutable_pattern)
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    # ---- index ----
+    def preload(self):
+        """Hash and compress every file up front, so no request pays for it."""
+        count = before = after = 0
+        for root, dirs, files in os.walk(self.directory):
+            # same rule as requests: no dot-directories (.git, .bolt, ...)
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d != "node_modules"]
+            for name in files:
+                if name.startswith(".") or name.endswith((".br", ".gz")):
+                    continue
+                rel = os.path.relpath(os.path.join(root, name), self.directory).replace(os.sep, "/")
+                asset = self._asset(rel)
+                if asset is not None and asset.encoded:
+                    count += 1
+                    before += asset.size
+                    after += min(len(body) for body in asset.encoded.values())
+        logger.info(f"Precompressed {count} static files in {self.directory}: {before // 1024} KB -> {after // 1024} KB")
+
+    def _asset(self, rel: str):
+        """Current asset for `rel`, rebuilt if the file changed since it was indexed."""
+        path = os.path.join(self.directory, rel)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        asset = self._assets.get(rel)
+        if asset is not None and asset.mtime == st.st_mtime and asset.size == st.st_size:
+            return asset
+        asset = self._build(rel, path, st)
+        with self._lock:
+            self._assets[rel] = asset
+        return asset
+
+    def _build(self, rel: str, path: str, st) -> StaticAsset:
+        media_type = mimetypes.guess_type(path)[0] or "text/plain"
+        sha = hashlib.sha256()
+        data = None
+        compress = _compressible(media_type) and STATIC_MIN_COMPRESS_BYTES <= st.st_size <= STATIC_MAX_COMPRESS_MB * 1024 * 1024
+        with open(path, "rb") as f:
+            if compress:
+                data = f.read()
+                sha.update(data)
+            else:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha.update(chunk)
+
+        encoded = {}
+        if compress:
+            for coding in ENCODING_PREFERENCE:
+                body = self._sidecar(path, st, coding)
+                if body is None:
+                    body = self._compress(data, coding)
+                # only worth a Content-Encoding if it actually saves bytes
+                if body is not None and len(body) < st.st_size * 0.95:
+                    encoded[coding] = body
+
+        cache_control = IMMUTABLE if self.immutable.match(rel) else STATIC_CACHE_CONTROL
+        return StaticAsset(path, st.st_size, st.st_mtime, media_type, sha.hexdigest()[:32], cache_control, encoded)
+
+    @staticmethod
+    def _sidecar(path: str, st, coding: str):
+        sidecar = path + SIDECAR_SUFFIX[coding]
+        try:
+            if os.stat(sidecar).st_mtime >= st.st_mtime:
+                with open(sidecar, "rb") as f:
+                    return f.read()
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def _compress(data: bytes, coding: str):
+        if coding == "br":
+            if brotli is None:
+                return None
+            return brotli.compress(data, quality=STATIC_BROTLI_QUALITY)
+        # mtime=0 keeps the bytes (and so the ETag) stable across restarts
+        return gzip.compress(data, compresslevel=STATIC_GZIP_LEVEL, mtime=0)
+
+    # ---- lookup ----
+    def _resolve(self, url_path: str):
+        """Map a URL path to (relative file path, is_directory_without_slash)."""
+        rel = url_path.lstrip("/")
+        parts = [p for p in rel.split("/") if p]
+        if any(p.startswith(".") for p in parts):
+            return None, False
+        full = os.path.realpath(os.path.join(self.directory, *parts))
+        if full != self.directory and not full.startswith(self.directory + os.sep):
+            return None, False
+        rel = os.path.relpath(full, self.directory).replace(os.sep, "/")
+        if os.path.isdir(full):
+            index = "index.html" if rel == "." else f"{rel}/index.html"
+            return index, bool(parts) and not url_path.endswith("/")
+        return rel, False
+
+    # ---- ASGI ----
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        response = await self.get_response(scope)
+        await response(scope, receive, send)
+
+    async def get_response(self, scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return PlainTextResponse("Method Not Allowed", status_code=405)
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+
+        rel, needs_slash = self._resolve(scope["path"])
+        asset = await run_in_threadpool(self._asset, rel) if rel else None
+        if asset is not None and needs_slash:
+            # same as StaticFiles(html=True): /dir -> /dir/ so relative links resolve
+            url = scope["path"] + "/"
+            if scope.get("query_string"):
+                url += "?" + scope["query_string"].decode("latin-1")
+            return RedirectResponse(url=url)
+        if asset is None:
+            not_found = await run_in_threadpool(self._asset, "404.html")
+            if not_found is not None:
+                return self._respond(not_found, headers, scope["method"], status_code=404)
+            return PlainTextResponse("Not Found", status_code=404)
+        return self._respond(asset, headers, scope["method"])
+
+    def _respond(self, asset: StaticAsset, request_headers: dict, method: str, status_code: int = 200) -> Response:
+        coding = choose_encoding(request_headers.get("accept-encoding"), asset.encoded)
+        # a strong ETag names exact bytes, so each encoding gets its own
+        etag = f'"{asset.etag}-{coding}"' if coding else f'"{asset.etag}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": http_date(asset.mtime),
+            "Cache-Control": asset.cache_control,
+        }
+        if asset.encoded:
+            headers["Vary"] = "Accept-Encoding"
+
+        if status_code == 200 and not_modified(request_headers, etag, asset.mtime):
+            return Response(status_code=304, headers=headers)
+        if coding is None:
+            return FileResponse(asset.path, status_code=status_code, headers=headers,
+                                media_type=asset.media_type, method=method)
+
+        body = asset.encoded[coding]
+        headers["Content-Encoding"] = coding
+        headers["Content-Length"] = str(len(body))
+        return Response(b"" if method == "HEAD" else body, status_code=status_code,
+                        headers=headers, media_type=asset.media_type)
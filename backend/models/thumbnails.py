@@ -0,0 +1,173 @@
+import io
+import os
+import logging
+import warnings
+from calendar import timegm
+from dotenv import load_dotenv
+from pathlib import Path
+from PIL import Image, ImageOps
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from backend.models.blob_store import blob_store
+from backend.models.cache import AsyncSingleFlight
+from backend.models.db import run_db, ImageVariant
+from backend.models.workers import run_cpu
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+THUMBNAIL_SIZES = tuple(sorted(int(s) for s in os.getenv("THUMBNAIL_SIZES", "64,128,256").split(",")))
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "82"))
+MAX_IMAGE_MB = float(os.getenv("MAX_IMAGE_MB", "5"))
+# a few KB of PNG can decode to gigapixels; refuse anything bigger than this
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", "40000000"))
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+ACCEPTED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "BMP"}
+# output name -> (Pillow format, media type, save options)
+OUTPUT_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": THUMBNAIL_QUALITY, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": THUMBNAIL_QUALITY, "optimize": True, "progressive": True}),
+}
+
+
+def _open(data: bytes) -> Image.Image:
+    with warnings.catch_warnings():
+        # Pillow only warns between 1x and 2x the limit; treat that as too big too
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        try:
+            image = Image.open(io.BytesIO(data))
+        except (Image.DecompressionBombError, Image.DecompressionBombWarning):
+            raise ValueError("Image dimensions are too large")
+        except Exception:
+            raise ValueError("File is not a supported image")
+    if image.format not in ACCEPTED_FORMATS:
+        raise ValueError(f"Unsupported image format: {image.format}")
+    return image
+
+
+def probe_image(data: bytes) -> str:
+    """Check the header only (cheap enough for the request path); returns the format."""
+    with _open(data) as image:
+        return image.format
+
+
+def make_thumbnails(data: bytes, sizes=THUMBNAIL_SIZES) -> dict:
+    """
+    Square, centre-cropped RGB thumbnails of `data` in every OUTPUT_FORMATS
+    format, as {(size, format): bytes}. EXIF orientation is applied and all
+    metadata dropped; transparency is flattened onto white.
+    """
+    with _open(data) as image:
+        # JPEG decoders can downscale while decoding; much cheaper for camera photos
+        image.draft("RGB", (max(sizes) * 2, max(sizes) * 2))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            image = image.convert("RGB")
+
+        thumbnails = {}
+        for size in sorted(sizes, reverse=True):
+            thumb = ImageOps.fit(image, (size, size), Image.LANCZOS)
+            for name, (pil_format, _, options) in OUTPUT_FORMATS.items():
+                buffer = io.BytesIO()
+                thumb.save(buffer, pil_format, **options)
+                thumbnails[(size, name)] = buffer.getvalue()
+            # each smaller size is resampled from the previous one
+            image = thumb
+        return thumbnails
+
+
+# -------------------------------
+# Stored variants
+# -------------------------------
+class Variant:
+    __slots__ = ("blob", "media_type", "last_modified")
+
+    def __init__(self, blob: str, media_type: str, last_modified: float):
+        self.blob = blob
+        self.media_type = media_type
+        self.last_modified = last_modified
+
+
+def _variants_for(db, source: str) -> dict:
+    rows = db.query(ImageVariant).filter(ImageVariant.source == source).all()
+    return {
+        (row.size, row.format): Variant(row.blob, OUTPUT_FORMATS[row.format][1], timegm(row.created_at.utctimetuple()))
+        for row in rows if row.format in OUTPUT_FORMATS
+    }
+
+
+def _add_variants(db, source: str, blobs: dict) -> list:
+    """Insert the rows that don't exist yet; returns the blobs of the ones that did."""
+    existing = {(row.size, row.format) for row in db.query(ImageVariant).filter(ImageVariant.source == source)}
+    for (size, name), blob in blobs.items():
+        if (size, name) not in existing:
+            db.add(ImageVariant(source=source, size=size, format=name, blob=blob))
+    return [blob for key, blob in blobs.items() if key in existing]
+
+
+def _store(thumbnails: dict) -> dict:
+    # each variant row holds one reference to its blob
+    blobs = {}
+    try:
+        for key, data in thumbnails.items():
+            blobs[key] = blob_store.put_bytes(data)
+    except BaseException:
+        _release(blobs.values())
+        raise
+    return blobs
+
+
+def _release(blobs):
+    for blob in blobs:
+        blob_store.decref(blob)
+
+
+async def generate_thumbnails(source: str) -> dict:
+    """Render, store and record every thumbnail of the blob `source`."""
+    data = await run_in_threadpool(blob_store.read, source)
+    thumbnails = await run_cpu(make_thumbnails, data)
+    blobs = await run_in_threadpool(_store, thumbnails)
+    try:
+        # rows another worker process got there first with
+        unused = await run_db(_add_variants, source, blobs)
+    except IntegrityError:
+        # ...between our check and our commit: the insert rolled back, so no row holds our references
+        unused = list(blobs.values())
+    except BaseException:
+        await run_in_threadpool(_release, blobs.values())
+        raise
+    await run_in_threadpool(_release, unused)
+    logger.info(f"Stored {len(blobs)} thumbnails for image {source[:12]}")
+    return await run_db(_variants_for, source)
+
+
+_in_flight = AsyncSingleFlight()
+
+
+def schedule_thumbnails(source: str):
+    """Start generating in the background; the request that uploaded the image doesn't wait."""
+    _in_flight.start(source, generate_thumbnails, source).add_done_callback(_log_failure)
+
+
+def _log_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Thumbnail generation failed: {task.exception()}")
+
+
+async def stored_thumbnails(source: str) -> dict:
+    return await run_db(_variants_for, source)
+
+
+async def wait_for_thumbnails(source: str) -> dict:
+    """Join the background run for `source` (or start one, e.g. after a restart)."""
+    return await _in_flight.do(source, generate_thumbnails, source)
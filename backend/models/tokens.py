@@ -0,0 +1,82 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import logging
+import secrets
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", "3600"))
+JWT_SECRET = os.getenv("JWT_SECRET")
+if not JWT_SECRET:
+    # fine for development; with several workers or restarts, tokens stop verifying
+    JWT_SECRET = secrets.token_urlsafe(32)
+    logger.warning("JWT_SECRET is not set; using a random per-process secret")
+
+_HEADER = {"alg": "HS256", "typ": "JWT"}
+
+
+class InvalidToken(Exception):
+    """Malformed, wrongly signed or expired access token."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _sign(signing_input: bytes, secret: str) -> bytes:
+    return hmac.new(secret.encode("utf-8"), signing_input, hashlib.sha256).digest()
+
+
+def create_access_token(subject: str, claims: dict = None, ttl: int = None, secret: str = None) -> str:
+    """Return an HS256 JWT for `subject` (the username), valid for `ttl` seconds."""
+    now = int(time.time())
+    payload = {"sub": subject, "iat": now, "exp": now + (ACCESS_TOKEN_TTL if ttl is None else ttl), **(claims or {})}
+    signing_input = ".".join(
+        _b64encode(json.dumps(part, separators=(",", ":")).encode("utf-8")) for part in (_HEADER, payload)
+    )
+    signature = _sign(signing_input.encode("ascii"), secret or JWT_SECRET)
+    return f"{signing_input}.{_b64encode(signature)}"
+
+
+def decode_access_token(token: str, secret: str = None) -> dict:
+    """Verify signature and expiry and return the claims. Raises InvalidToken."""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+    except (ValueError, AttributeError) as e:
+        raise InvalidToken("malformed token") from e
+    if not isinstance(header, dict):
+        raise InvalidToken("malformed header")
+
+    # only accept what we issue; never trust the token to pick the algorithm
+    if header.get("alg") != _HEADER["alg"]:
+        raise InvalidToken("unsupported algorithm")
+    expected = _sign(f"{header_b64}.{payload_b64}".encode("ascii"), secret or JWT_SECRET)
+    if not hmac.compare_digest(signature, expected):
+        raise InvalidToken("bad signature")
+
+    try:
+        claims = json.loads(_b64decode(payload_b64))
+    except ValueError as e:
+        raise InvalidToken("malformed payload") from e
+    if not isinstance(claims, dict):
+        raise InvalidToken("malformed payload")
+    if not isinstance(claims.get("exp"), int) or claims["exp"] <= time.time():
+        raise InvalidToken("token expired")
+    return claims
@@ -0,0 +1,103 @@
+import os
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+
+# -------------------------------
+# Settings (override via .env)
+# -------------------------------
+# processes for PyMuPDF extraction and WeasyPrint rendering
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 2)))
+# tasks allowed to wait for a free worker before we start rejecting
+CPU_QUEUE_DEPTH = int(os.getenv("CPU_QUEUE_DEPTH", "64"))
+# threads for bcrypt (it releases the GIL); a signup burst queues here, not on the event loop
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_DEPTH = int(os.getenv("PASSWORD_QUEUE_DEPTH", "64"))
+# "spawn" keeps children clear of the event loop's threads and locks
+WORKER_START_METHOD = os.getenv("WORKER_START_METHOD", "spawn")
+
+
+class PoolSaturated(Exception):
+    """Raised when a pool already has its maximum number of tasks queued."""
+
+
+class BoundedPool:
+    """
+    An executor plus admission control: at most `workers + queue_depth`
+    tasks may be submitted at once, beyond that `run` raises PoolSaturated.
+    The executor is created on first use.
+    """
+
+    def __init__(self, name, make_executor, workers, queue_depth):
+        self.name = name
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._make_executor = make_executor
+        self._executor = None
+        self.pending = 0
+
+    @property
+    def capacity(self):
+        return self.workers + self.queue_depth
+
+    def executor(self):
+        if self._executor is None:
+            self._executor = self._make_executor(self.workers)
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        if self.pending >= self.capacity:
+            raise PoolSaturated(f"{self.name} pool is full ({self.pending} tasks pending)")
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self.executor(), functools.partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _warm_up_worker():
+    # compile theme stylesheets once per process instead of on the first render
+    from backend.models.renderer import preload_themes
+    preload_themes()
+
+
+def _process_executor(workers):
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+        initializer=_warm_up_worker,
+    )
+
+
+def _thread_executor(workers):
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+
+
+cpu_pool = BoundedPool("cpu", _process_executor, CPU_WORKERS, CPU_QUEUE_DEPTH)
+password_pool = BoundedPool("password", _thread_executor, PASSWORD_WORKERS, PASSWORD_QUEUE_DEPTH)
+
+
+async def run_cpu(fn, *args, **kwargs):
+    """Run a picklable CPU-bound function in the process pool."""
+    return await cpu_pool.run(fn, *args, **kwargs)
+
+
+async def run_password(fn, *args, **kwargs):
+    """Run a password hash/verify in its own small thread pool."""
+    return await password_pool.run(fn, *args, **kwargs)
+
+
+def shutdown_pools():
+    cpu_pool.shutdown()
+    password_pool.shutdown()
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from pydantic import BaseModel
+from typing import List, Optional
+import json
+import time
+import logging
+
+from backend.models.ats_score import score_resume
+from backend.models.pipeline import extract_markdown_bytes
+from backend.models.ingest import read_pdf_upload, UploadRejected
+from backend.models.workers import PoolSaturated, run_cpu
+
+router = APIRouter(tags=["score"])
+logger = logging.getLogger(__name__)
+
+# keep one request from monopolising the worker
+MAX_JOB_DESCRIPTIONS = 5000
+# small batches score in a few ms inline; bigger ones go to the process pool
+INLINE_BATCH_SIZE = 100
+
+
+class ScoreResult(BaseModel):
+    score: float
+    coverage: float
+    keywords: int
+    matched_keywords: List[str]
+    missing_keywords: List[str]
+
+
+class ScoreResponse(BaseModel):
+    results: List[ScoreResult]
+    elapsed_ms: float
+
+
+def parse_job_descriptions(job_description: List[str], job_descriptions: Optional[str],
+                           max_items: int = MAX_JOB_DESCRIPTIONS) -> List[str]:
+    """Merge repeated `job_description` form fields and a JSON-array `job_descriptions` field."""
+    jds = [jd for jd in job_description if jd and jd.strip()]
+    if job_descriptions:
+        try:
+            batch = json.loads(job_descriptions)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="job_descriptions must be a JSON array of strings")
+        if not isinstance(batch, list) or not all(isinstance(jd, str) for jd in batch):
+            raise HTTPException(status_code=422, detail="job_descriptions must be a JSON array of strings")
+        jds.extend(batch)
+    if not jds:
+        raise HTTPException(status_code=422, detail="Provide at least one job description")
+    if len(jds) > max_items:
+        raise HTTPException(status_code=413, detail=f"At most {max_items} job descriptions per request")
+    return jds
+
+
+@router.post("/score", response_model=ScoreResponse, summary="Keyword-match a resume against job descriptions")
+async def score(
+    file: UploadFile = File(None),
+    resume_text: Optional[str] = Form(None),
+    job_description: List[str] = Form([]),
+    job_descriptions: Optional[str] = Form(None),
+):
+    """
+    Deterministic ATS-style keyword scoring, no LLM involved.
+
+    Send the resume as a PDF `file` (or as plain `resume_text`) and one or
+    more job descriptions, either as repeated `job_description` fields or as a
+    JSON array in `job_descriptions`. Results come back in the same order.
+    """
+    jds = parse_job_descriptions(job_description, job_descriptions)
+    if file is None and not resume_text:
+        raise HTTPException(status_code=422, detail="Provide a resume PDF or resume_text")
+
+    try:
+        # same checks, extraction (and cache) as /upload/
+        if file is not None:
+            pdf = await read_pdf_upload(file)
+            resume = await extract_markdown_bytes(pdf.data, pdf.digest)
+        else:
+            resume = resume_text
+
+        start = time.perf_counter()
+        if len(jds) <= INLINE_BATCH_SIZE:
+            results = score_resume(resume, jds)
+        else:
+            results = await run_cpu(score_resume, resume, jds)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except PoolSaturated as e:
+        logger.warning(f"Rejecting score request: {e}")
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "5"})
+
+    return ScoreResponse(results=results, elapsed_ms=round((time.perf_counter() - start) * 1000, 2))
@@ -0,0 +1,112 @@
+import asyncio
+import os
+
+from backend.models import job_queue
+from backend.models.blob_store import BlobStore
+from backend.models.job_queue import DONE, Job, JobQueue
+
+
+def _refcount(store, digest):
+    return store._db.execute("SELECT refcount FROM blobs WHERE digest = ?", (digest,)).fetchone()[0]
+
+
+def test_put_counts_one_reference_per_call(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.put_bytes(b"resume")
+    assert store.put_bytes(b"resume") == digest
+    assert _refcount(store, digest) == 2
+
+
+def test_put_after_missing_file_counts_once(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.put_bytes(b"resume")
+    os.remove(store.path(digest))
+
+    store.put_bytes(b"resume")
+    assert store.read(digest) == b"resume"
+    assert _refcount(store, digest) == 2
+    store.decref(digest)
+    store.decref(digest)
+    assert _refcount(store, digest) == 0
+
+
+def test_gc_keeps_referenced_blobs(tmp_path):
+    store = BlobStore(str(tmp_path), max_age=-1)
+    kept = store.put_bytes(b"kept")
+    dropped = store.put_bytes(b"dropped")
+    store.decref(dropped)
+    assert store.gc()["removed"] == 1
+    assert os.path.exists(store.path(kept))
+    assert not os.path.exists(store.path(dropped))
+
+
+def test_job_queue_stop_releases_pending_jobs(tmp_path):
+    store = BlobStore(str(tmp_path))
+
+    async def never_finishes(job):
+        await asyncio.sleep(3600)
+
+    async def release(job):
+        store.decref(job.params["blob"])
+
+    async def main():
+        queue = JobQueue(never_finishes, workers=1, on_expire=release)
+        queue.start()
+        digests = [store.put_bytes(f"resume {i}".encode()) for i in range(3)]
+        for digest in digests:
+            queue.submit(Job(blob=digest))
+        await asyncio.sleep(0)
+        await queue.stop()
+        return digests
+
+    for digest in asyncio.run(main()):
+        assert _refcount(store, digest) == 0
+
+
+def test_job_queue_retries_instead_of_failing_on_retry_on(monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_RETRY_BASE_DELAY", 0.001)
+    attempts = []
+
+    class Busy(Exception):
+        pass
+
+    async def handler(job):
+        attempts.append(job.id)
+        if len(attempts) < 3:
+            raise Busy("pool is full")
+        return "result"
+
+    async def main():
+        queue = JobQueue(handler, workers=1, retry_on=(Busy,))
+        queue.start()
+        job = queue.submit(Job())
+        while not job.finished:
+            await asyncio.sleep(0.005)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(main())
+    assert (job.stage, job.result, len(attempts)) == (DONE, "result", 3)
+
+
+def test_store_is_opened_lazily(tmp_path):
+    root = tmp_path / "blobs"
+    store = BlobStore(str(root))
+    assert not root.exists()
+    store.put_bytes(b"resume")
+    assert (root / "index.db").exists()
+
+
+def test_gc_does_not_delete_a_blob_another_process_just_referenced(tmp_path):
+    # two stores on one root stand in for two worker processes
+    collector = BlobStore(str(tmp_path), max_age=-1)
+    uploader = BlobStore(str(tmp_path))
+    digest = collector.put_bytes(b"resume")
+    collector.decref(digest)
+
+    # the collector has listed the blob as unreferenced; the uploader takes a ref before it deletes
+    assert uploader.put_bytes(b"resume") == digest
+    assert not collector._delete_unreferenced(digest)
+    assert collector.gc()["removed"] == 0
+    assert uploader.read(digest) == b"resume"
+    assert _refcount(uploader, digest) == 1
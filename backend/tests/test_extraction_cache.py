@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+from backend.models.extraction_cache import ExtractionCache
+
+
+def _track_disk_threads(cache, threads):
+    disk_get, disk_put = cache._disk_get, cache._disk_put
+
+    def tracked_get(key):
+        threads.append(threading.current_thread())
+        return disk_get(key)
+
+    def tracked_put(key, value):
+        threads.append(threading.current_thread())
+        return disk_put(key, value)
+
+    cache._disk_get, cache._disk_put = tracked_get, tracked_put
+
+
+def test_async_disk_tier_stays_off_the_event_loop(tmp_path):
+    threads = []
+
+    async def main():
+        writer = ExtractionCache(disk_dir=str(tmp_path))
+        _track_disk_threads(writer, threads)
+        await writer.aput("text-abc", "resume text")
+
+        # fresh memory tier: the value has to come from disk
+        reader = ExtractionCache(disk_dir=str(tmp_path))
+        _track_disk_threads(reader, threads)
+        assert await reader.aget("text-abc") == "resume text"
+        assert await reader.aget("text-missing") is None
+        # now in memory: answered without touching the disk
+        assert await reader.aget("text-abc") == "resume text"
+        return reader.stats()
+
+    stats = asyncio.run(main())
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (2, 1, 1)
+
+
+def test_memory_only_cache():
+    async def main():
+        cache = ExtractionCache(max_entries=1)
+        await cache.aput("text-a", "a")
+        await cache.aput("text-b", "b")
+        return await cache.aget("text-a"), await cache.aget("text-b")
+
+    assert asyncio.run(main()) == (None, "b")
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend import jobsuggest
+from backend.jobsuggest import router
+from backend.models import adzuna
+from backend.models.ingest import PDFUpload
+from backend.models.http_client import UpstreamError
+
+
+def _suggest(params):
+    app = FastAPI()
+    app.include_router(router)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            files = {"file": ("resume.pdf", b"%PDF-1.4", "application/pdf")}
+            return await client.post("/suggest-jobs/", params=params, files=files)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("countries", ["in,../../admin", "gb?x=1", "usa", "i1"])
+def test_invalid_country_codes_are_rejected(countries):
+    response = _suggest({"wide": "true", "countries": countries})
+    assert response.status_code == 422
+    assert "Invalid country code" in response.json()["error"]
+
+
+def test_fetch_refuses_unvalidated_country(monkeypatch):
+    monkeypatch.setenv("ADZUNA_APP_ID", "id")
+    monkeypatch.setenv("ADZUNA_APP_KEY", "key")
+    with pytest.raises(ValueError, match="Invalid country code"):
+        asyncio.run(adzuna._fetch("in/../x", "python", 10, 1, ("in/../x", "python", 10, 1)))
+
+
+def test_failed_background_refresh_is_logged(monkeypatch, caplog):
+    async def failing_fetch(*args):
+        raise UpstreamError(503, "maintenance")
+
+    async def main():
+        key = ("in", "python", 10, 1)
+        # stale entry: served at once while a refresh runs in the background
+        adzuna.search_cache.set(key, (time.monotonic() - adzuna.ADZUNA_CACHE_TTL - 1, [{"id": 1}]))
+        monkeypatch.setattr(adzuna, "_fetch", failing_fetch)
+        jobs = await adzuna.search_jobs("Python")
+        await asyncio.sleep(0.01)
+        return jobs
+
+    assert asyncio.run(main()) == [{"id": 1}]
+    assert "Adzuna background refresh failed" in caplog.text
+
+
+def test_single_search_uses_the_first_country(monkeypatch):
+    searched = []
+
+    async def text(data, digest=None):
+        return "Python developer"
+
+    async def query(resume_text):
+        return "python developer"
+
+    async def search(query, country=adzuna.DEFAULT_COUNTRY, results_per_page=10):
+        searched.append(country)
+        return []
+
+    monkeypatch.setattr(jobsuggest, "read_pdf_upload", lambda file: _upload())
+    monkeypatch.setattr(jobsuggest, "aextract_text_from_data", text)
+    monkeypatch.setattr(jobsuggest, "get_job_search_query", query)
+    monkeypatch.setattr(jobsuggest, "search_jobs", search)
+    response = _suggest({"countries": "gb,us"})
+    assert response.status_code == 200
+    assert searched == ["gb"]
+
+
+async def _upload():
+    return PDFUpload(b"%PDF-1.4", "0" * 64, 1)
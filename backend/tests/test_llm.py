@@ -0,0 +1,41 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.models import http_client, llm
+from backend.models.http_client import UpstreamError
+from backend.models.llm import cache_key, result_cache, stream_optimized_resume
+
+
+async def _collect(stream):
+    return [token async for token in stream]
+
+
+def test_empty_stream_is_not_cached(monkeypatch):
+    async def empty_stream(*args, **kwargs):
+        return
+        yield
+
+    monkeypatch.setattr(llm.gateway, "stream", empty_stream)
+    assert asyncio.run(_collect(stream_optimized_resume("# Jane", "empty reply"))) == []
+    assert result_cache.get(cache_key("# Jane", "empty reply")) is None
+
+
+def test_truncated_stream_is_not_cached(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    # one token, then the connection closes without [DONE]
+    body = b'data: {"choices": [{"delta": {"content": "# Jane"}}]}\n\n'
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+
+    async def main():
+        monkeypatch.setattr(http_client, "get_client", lambda: httpx.AsyncClient(transport=transport))
+        monkeypatch.setattr(http_client, "_semaphore", asyncio.Semaphore(1))
+        tokens = []
+        with pytest.raises(UpstreamError):
+            async for token in stream_optimized_resume("# Jane", "cut off"):
+                tokens.append(token)
+        return tokens
+
+    assert asyncio.run(main()) == ["# Jane"]
+    assert result_cache.get(cache_key("# Jane", "cut off")) is None
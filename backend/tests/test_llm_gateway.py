@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from backend.models import llm_gateway
+from backend.models.http_client import UpstreamError
+from backend.models.llm_gateway import CircuitBreaker, CircuitOpenError, LLMGateway
+
+
+def _half_open_gateway():
+    gateway = LLMGateway(rpm=6000, tpm=10_000_000, max_retries=0)
+    gateway.breaker = CircuitBreaker(failures=1, reset_timeout=0.01)
+    gateway.breaker.record_failure()
+    return gateway
+
+
+async def _wait_half_open(breaker):
+    while breaker.state != "half_open":
+        await asyncio.sleep(0.005)
+
+
+def _ok_response():
+    return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+
+
+def test_breaker_allows_one_trial_when_half_open():
+    breaker = CircuitBreaker(failures=1, reset_timeout=0.0)
+    breaker.record_failure()
+    trial = breaker.before_call()
+    assert trial is not None
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.abort_trial(trial)
+    assert breaker.before_call() is not None
+
+
+def test_cancelled_half_open_trial_releases_the_slot(monkeypatch):
+    started = asyncio.Event()
+
+    async def hanging_chat(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def main():
+        gateway = _half_open_gateway()
+        await _wait_half_open(gateway.breaker)
+
+        monkeypatch.setattr(llm_gateway, "groq_chat", hanging_chat)
+        trial = asyncio.create_task(gateway.chat([{"role": "user", "content": "hi"}]))
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        async def ok_chat(*args, **kwargs):
+            return _ok_response()
+
+        monkeypatch.setattr(llm_gateway, "groq_chat", ok_chat)
+        assert await gateway.chat([{"role": "user", "content": "hi"}]) == "ok"
+        assert gateway.breaker.state == "closed"
+
+    asyncio.run(main())
+
+
+def test_half_open_stream_with_bad_chunk_releases_the_slot(monkeypatch):
+    async def bad_stream(*args, **kwargs):
+        yield json.loads("{not json")
+
+    async def main():
+        gateway = _half_open_gateway()
+        await _wait_half_open(gateway.breaker)
+
+        monkeypatch.setattr(llm_gateway, "groq_chat_stream", bad_stream)
+        with pytest.raises(ValueError):
+            async for _ in gateway.stream([{"role": "user", "content": "hi"}]):
+                pass
+        # next caller becomes the new trial instead of being rejected
+        assert gateway.breaker.before_call() is not None
+
+    asyncio.run(main())
+
+
+def test_abandoned_half_open_stream_releases_the_slot(monkeypatch):
+    async def endless_stream(*args, **kwargs):
+        while True:
+            yield "token"
+
+    async def main():
+        gateway = _half_open_gateway()
+        await _wait_half_open(gateway.breaker)
+
+        monkeypatch.setattr(llm_gateway, "groq_chat_stream", endless_stream)
+        stream = gateway.stream([{"role": "user", "content": "hi"}])
+        assert await stream.__anext__() == "token"
+        # client disconnected: the generator is closed mid-stream
+        await stream.aclose()
+        assert gateway.breaker.before_call() is not None
+
+    asyncio.run(main())
+
+
+def test_stream_429_honours_retry_after(monkeypatch):
+    calls, delays = [], []
+
+    async def limited_then_ok(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise UpstreamError(429, "slow down", {"retry-after": "7"})
+        yield "ok"
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    async def main():
+        gateway = LLMGateway(rpm=6000, tpm=10_000_000, max_retries=1)
+        monkeypatch.setattr(llm_gateway, "groq_chat_stream", limited_then_ok)
+        monkeypatch.setattr(llm_gateway.asyncio, "sleep", fake_sleep)
+        monkeypatch.setattr(gateway.limiter, "drain", lambda seconds: delays.append(("drain", seconds)))
+        return [token async for token in gateway.stream([{"role": "user", "content": "hi"}])]
+
+    assert asyncio.run(main()) == ["ok"]
+    assert delays[0] == ("drain", 7.0)
+    assert 7.0 <= delays[1] < 8.0
+
+
+def test_chat_with_null_content_returns_empty_text(monkeypatch):
+    async def null_content(*args, **kwargs):
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": None}}]})
+
+    monkeypatch.setattr(llm_gateway, "groq_chat", null_content)
+    gateway = LLMGateway(rpm=6000, tpm=10_000_000, max_retries=0)
+    assert asyncio.run(gateway.chat([{"role": "user", "content": "hi"}])) == ""
+
+
+def test_limiter_works_across_event_loops():
+    # e.g. generate_optimized_resume: one asyncio.run per call, sharing the module-level gateway
+    limiter = llm_gateway.RateLimiter(rpm=6000, tpm=6000)
+
+    async def contended(first):
+        # the second caller has to wait on the limiter's condition
+        await asyncio.gather(limiter.acquire(first), limiter.acquire(5))
+
+    asyncio.run(contended(6000))
+    asyncio.run(contended(5))
+    assert limiter.waiting == 0
@@ -0,0 +1,58 @@
+from backend.models.prompt_compact import compact_resume
+
+
+def _markdown(*pages):
+    """Pages in the '# Page N' + code fence layout pdf_bytes_to_markdown produces."""
+    out = []
+    for n, text in enumerate(pages, start=1):
+        out += [f"# Page {n}\n", "```", text, "```\n"]
+    return "\n".join(out)
+
+
+def test_phone_and_year_lines_survive():
+    text = _markdown("Jane Doe\n9876543210\nEXPERIENCE\nAcme Corp\n2021\nBuilt APIs\n2019")
+    lines = compact_resume(text).text.splitlines()
+    assert "9876543210" in lines
+    assert "2021" in lines
+    # a year on the last line of a page is not a page number either
+    assert "2019" in lines
+
+
+def test_page_markers_on_page_edges_are_dropped():
+    text = _markdown(
+        "Jane Doe\nEXPERIENCE\nAcme Corp\nPage 1 of 2",
+        "2\nEDUCATION\nState University\n- 2 -",
+    )
+    lines = compact_resume(text).text.splitlines()
+    assert "Page 1 of 2" not in lines
+    assert "2" not in lines
+    assert "- 2 -" not in lines
+    assert "State University" in lines
+
+
+def test_short_numbers_inside_a_page_are_kept():
+    text = _markdown("Jane Doe\nTEAM SIZE\n12\nLed the platform team")
+    assert "12" in compact_resume(text).text.splitlines()
+
+
+def _resume(name):
+    return "\n".join([
+        name, "jane@example.com | +1 555 0100",
+        "SUMMARY", "Backend engineer building Python services. " * 3,
+        "EXPERIENCE", "Acme Corp - built APIs and data pipelines. " * 6,
+        "EDUCATION", "State University, BSc Computer Science",
+        "HOBBIES", "Chess, hiking, photography and long-distance cycling. " * 3,
+    ])
+
+
+def test_uppercase_name_stays_in_the_preamble_under_budget():
+    result = compact_resume(_resume("JANE DOE"), token_budget=120)
+    assert result.truncated
+    assert result.text.startswith("JANE DOE\njane@example.com")
+
+
+def test_heading_cut_to_nothing_is_dropped():
+    for budget in range(60, 200, 5):
+        blocks = compact_resume(_resume("Jane Doe"), token_budget=budget).text.split("\n\n")
+        # every block after the preamble still has a body under its heading
+        assert all("\n" in block for block in blocks[1:]), (budget, blocks)
@@ -0,0 +1,58 @@
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+from sqlalchemy.exc import IntegrityError
+
+from backend.models import thumbnails
+from backend.models.blob_store import BlobStore
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), (200, 30, 30)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path))
+    monkeypatch.setattr(thumbnails, "blob_store", store)
+
+    async def run_inline(fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(thumbnails, "run_cpu", run_inline)
+    return store
+
+
+def _referenced(store):
+    return store.stats()["referenced"]
+
+
+def test_concurrent_insert_releases_thumbnail_refs(store, monkeypatch):
+    source = store.put_bytes(_png())
+
+    async def run_db(fn, *args):
+        if fn is thumbnails._add_variants:
+            # another worker process committed the same rows between our check and our commit
+            raise IntegrityError("INSERT INTO image_variants", {}, Exception("UNIQUE constraint failed"))
+        return {}
+
+    monkeypatch.setattr(thumbnails, "run_db", run_db)
+    asyncio.run(thumbnails.generate_thumbnails(source))
+    # only the source image is still referenced
+    assert _referenced(store) == 1
+
+
+def test_failed_insert_releases_thumbnail_refs(store, monkeypatch):
+    source = store.put_bytes(_png())
+
+    async def run_db(fn, *args):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(thumbnails, "run_db", run_db)
+    with pytest.raises(RuntimeError):
+        asyncio.run(thumbnails.generate_thumbnails(source))
+    assert _referenced(store) == 1
@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.models.tokens import InvalidToken, _b64encode, _sign, create_access_token, decode_access_token
+
+SECRET = "test-secret"
+
+
+def _signed(header, payload):
+    signing_input = ".".join(_b64encode(json.dumps(part).encode()) for part in (header, payload))
+    return f"{signing_input}.{_b64encode(_sign(signing_input.encode(), SECRET))}"
+
+
+def test_round_trip():
+    claims = decode_access_token(create_access_token("jane", {"uid": 7}, secret=SECRET), secret=SECRET)
+    assert claims["sub"] == "jane" and claims["uid"] == 7
+
+
+@pytest.mark.parametrize("token", [
+    "W10.e30.AA",                                        # header is a JSON array
+    "bm90IGpzb24.e30.AA",                                # header is not JSON
+    _signed([], {"sub": "jane"}),                        # signed, but header is an array
+    _signed({"alg": "HS256", "typ": "JWT"}, ["jane"]),   # signed, but claims are an array
+    _signed({"alg": "none", "typ": "JWT"}, {"sub": "jane", "exp": 2**40}),
+    "not-a-token",
+])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(InvalidToken):
+        decode_access_token(token, secret=SECRET)
+
+
+def test_expired_token_is_rejected():
+    with pytest.raises(InvalidToken):
+        decode_access_token(create_access_token("jane", ttl=-1, secret=SECRET), secret=SECRET)
+
+
+def test_me_with_non_object_header_is_401():
+    from backend.auth import router
+
+    app = FastAPI()
+    app.include_router(router)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/me", headers={"Authorization": "Bearer W10.e30.AA"})
+
+    assert asyncio.run(main()).status_code == 401